@@ -1,12 +1,20 @@
 """FastAPI endpoint for event poster extraction."""
 
-from fastapi import APIRouter, File, UploadFile, Form, HTTPException
-from fastapi.responses import JSONResponse
-from typing import Optional
+from fastapi import APIRouter, Depends, File, UploadFile, Form, HTTPException, Request
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from typing import Any, AsyncIterator, Dict, Optional
+import asyncio
 import logging
 
+import orjson
+
 from app.core.pipeline import ExtractionPipeline
 from app.extractors.ocr_extractor import OCRExtractor
+from app.preprocessing.image_processor import ImageProcessor
+from app.preprocessing.complexity_scorer import ComplexityScorer, RouteDecider
+from app.postprocessing.normalizer import FieldNormalizer
+from app.postprocessing.validator import FieldValidator
+from app.llm.base import LLMAdapter
 from app.llm.factory import create_llm_adapter
 from app.config import get_settings
 
@@ -18,15 +26,40 @@ router = APIRouter()
 # Get settings
 settings = get_settings()
 
+# Size of each read from the uploaded file
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Pipeline components are stateless apart from settings, so share them across requests
+ocr_extractor = OCRExtractor(settings)
+preprocessor = ImageProcessor(settings)
+complexity_scorer = ComplexityScorer(settings)
+route_decider = RouteDecider(settings)
+normalizer = FieldNormalizer()
+validator = FieldValidator()
+
 
-@router.post("/extract")
+def get_default_adapter(request: Request) -> Optional[LLMAdapter]:
+    """Dependency returning the adapter built at startup from the configured key.
+
+    Args:
+        request: Incoming request
+
+    Returns:
+        Shared default adapter, or None if none is configured
+    """
+    return getattr(request.app.state, "llm_adapter", None)
+
+
+@router.post("/extract", response_class=ORJSONResponse)
 async def extract_event_data(
+    request: Request,
     file: UploadFile = File(..., description="Event poster image file"),
     lang: str = Form(default="en", description="OCR language code"),
     timezone: str = Form(default="UTC", description="Timezone for date/time interpretation"),
     force_route: Optional[str] = Form(default=None, description="Force specific route: 'ocr_first' or 'vision'"),
     api_key: Optional[str] = Form(default=None, description="Gemini API key (required for extraction)"),
-    provider: str = Form(default="gemini", description="LLM provider to use (default: 'gemini')")
+    provider: str = Form(default="gemini", description="LLM provider to use (default: 'gemini')"),
+    default_adapter: Optional[LLMAdapter] = Depends(get_default_adapter)
 ):
     """Extract structured event data from poster image.
 
@@ -41,7 +74,7 @@ async def extract_event_data(
 
     **Parameters:**
     - **file**: Image file (JPEG, PNG, or WebP format, max 10MB)
-    - **lang**: OCR language code (default: 'en'). Supported: 'en', 'ch', 'fr', 'de', etc.
+    - **lang**: OCR language code (default: 'en'), one of OCR_LANGS: 'en', 'ch', 'fr', 'de', etc.
     - **timezone**: Timezone for date/time interpretation (default: 'UTC')
     - **force_route**: Override automatic routing (optional)
         - 'ocr_first': Force OCR-first route
@@ -81,64 +114,203 @@ async def extract_event_data(
     }
     ```
     """
-    # Create LLM adapter with user-provided API key
+    _validate_request(file, lang, force_route)
+    image_bytes = await _read_upload(file)
+    pipeline = _create_pipeline(request, provider, api_key, default_adapter)
+
+    # Process image through pipeline
     try:
-        # Use user-provided key or fall back to env (for backward compatibility)
-        final_api_key = api_key or (settings.LLM_API_KEY if settings.LLM_API_KEY else None)
+        result = await pipeline.process(
+            image_bytes,
+            {
+                'lang': lang,
+                'timezone': timezone,
+                'force_route': force_route
+            }
+        )
 
-        if not final_api_key and provider != "mock":
-            raise HTTPException(
-                status_code=400,
-                detail="API key is required. Please provide your Gemini API key."
-            )
+        return ORJSONResponse(content=result)
 
-        llm_adapter = create_llm_adapter(
-            provider=provider,
-            api_key=final_api_key,
-            model=None
-        )
     except ValueError as e:
-        # Handle factory errors (unknown provider, missing key)
+        # Handle validation/processing errors
+        logger.warning(f"Extraction validation error: {e}")
         raise HTTPException(
             status_code=400,
             detail=str(e)
         )
     except Exception as e:
-        # Handle API authentication errors
-        error_msg = str(e).lower()
-        if "api key" in error_msg or "authentication" in error_msg or "unauthorized" in error_msg:
-            raise HTTPException(
-                status_code=401,
-                detail="Invalid API key. Please check your Gemini API key."
-            )
-        logger.error(f"Failed to create LLM adapter: {e}")
+        # Handle unexpected errors
+        logger.error(f"Extraction failed with error: {e}", exc_info=True)
         raise HTTPException(
             status_code=500,
-            detail=f"Failed to initialize LLM provider: {str(e)}"
+            detail=f"Extraction failed: {str(e)}"
         )
 
-    # Create pipeline with request-specific adapter
+
+@router.post("/extract/stream")
+async def extract_event_data_stream(
+    request: Request,
+    file: UploadFile = File(..., description="Event poster image file"),
+    lang: str = Form(default="en", description="OCR language code"),
+    timezone: str = Form(default="UTC", description="Timezone for date/time interpretation"),
+    force_route: Optional[str] = Form(default=None, description="Force specific route: 'ocr_first' or 'vision'"),
+    api_key: Optional[str] = Form(default=None, description="Gemini API key (required for extraction)"),
+    provider: str = Form(default="gemini", description="LLM provider to use (default: 'gemini')"),
+    default_adapter: Optional[LLMAdapter] = Depends(get_default_adapter)
+):
+    """Extract structured event data, streaming fields as they are generated.
+
+    Accepts the same parameters as `/extract` and responds with
+    Server-Sent Events:
+
+    - **field**: `{"name": str, "value": {...}}` as soon as the LLM has
+      produced a field. Values are raw (not yet normalized), and a vision
+      fallback reports its fields again.
+    - **result**: The complete extraction result, same schema as `/extract`
+    - **error**: `{"status_code": int, "detail": str}` if extraction fails
+
+    Request validation errors are returned as regular HTTP errors before
+    the stream starts.
+    """
+    _validate_request(file, lang, force_route)
+    image_bytes = await _read_upload(file)
+    pipeline = _create_pipeline(request, provider, api_key, default_adapter)
+
+    return StreamingResponse(
+        _stream_extraction(
+            pipeline,
+            image_bytes,
+            {
+                'lang': lang,
+                'timezone': timezone,
+                'force_route': force_route
+            }
+        ),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+def _sse_event(event: str, data: Any) -> bytes:
+    """Encode a Server-Sent Event.
+
+    Args:
+        event: Event name
+        data: JSON-serializable payload
+
+    Returns:
+        Encoded event
+    """
+    payload = orjson.dumps(data, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+    return b"event: " + event.encode() + b"\ndata: " + payload + b"\n\n"
+
+
+async def _stream_extraction(
+    pipeline: ExtractionPipeline,
+    image_bytes: bytes,
+    params: Dict[str, Any]
+) -> AsyncIterator[bytes]:
+    """Run the pipeline and yield its field, result, and error events.
+
+    The pipeline is cancelled if the client disconnects mid-stream.
+
+    Args:
+        pipeline: Extraction pipeline
+        image_bytes: Raw image bytes
+        params: Extraction parameters
+
+    Yields:
+        Encoded Server-Sent Events
+    """
+    queue: "asyncio.Queue[Optional[bytes]]" = asyncio.Queue()
+
+    async def on_field(name: str, value: Any) -> None:
+        await queue.put(_sse_event("field", {"name": name, "value": value}))
+
+    async def run() -> None:
+        try:
+            result = await pipeline.process(image_bytes, params, on_field=on_field)
+            await queue.put(_sse_event("result", result))
+        except ValueError as e:
+            logger.warning(f"Extraction validation error: {e}")
+            await queue.put(_sse_event("error", {"status_code": 400, "detail": str(e)}))
+        except Exception as e:
+            logger.error(f"Extraction failed with error: {e}", exc_info=True)
+            await queue.put(_sse_event("error", {"status_code": 500, "detail": f"Extraction failed: {str(e)}"}))
+        finally:
+            await queue.put(None)
+
+    task = asyncio.create_task(run())
     try:
-        ocr_extractor = OCRExtractor(settings)
-        pipeline = ExtractionPipeline(llm_adapter, ocr_extractor, settings)
-    except Exception as e:
-        logger.error(f"Failed to initialize pipeline: {e}")
-        raise HTTPException(
-            status_code=500,
-            detail=f"Failed to initialize extraction pipeline: {str(e)}"
-        )
+        while (event := await queue.get()) is not None:
+            yield event
+    finally:
+        task.cancel()
+
+
+def _validate_request(file: UploadFile, lang: str, force_route: Optional[str]) -> None:
+    """Reject requests with an unsupported file type, language, route, or known size.
 
+    Args:
+        file: Uploaded image file
+        lang: OCR language code
+        force_route: Requested route override
+
+    Raises:
+        HTTPException: If the request is invalid
+    """
     # Validate file type
-    if file.content_type not in settings.ALLOWED_CONTENT_TYPES:
+    if file.content_type not in settings.allowed_content_types_set:
         raise HTTPException(
             status_code=400,
             detail=f"Invalid file type: {file.content_type}. "
                    f"Allowed types: {', '.join(settings.ALLOWED_CONTENT_TYPES)}"
         )
 
-    # Read file
+    # Validate OCR language (each one loads its own models)
+    if lang not in settings.ocr_langs_set:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unsupported OCR language: '{lang}'. "
+                   f"Supported: {', '.join(settings.OCR_LANGS)}"
+        )
+
+    # Validate force_route parameter
+    if force_route and force_route not in ['ocr_first', 'vision']:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid force_route value: '{force_route}'. "
+                   f"Must be 'ocr_first' or 'vision'"
+        )
+
+    # Reject oversize uploads up front when the size is already known
+    if file.size is not None and file.size > settings.MAX_FILE_SIZE:
+        raise HTTPException(
+            status_code=400,
+            detail=f"File too large: {file.size / 1024 / 1024:.1f}MB. "
+                   f"Maximum size: {settings.MAX_FILE_SIZE / 1024 / 1024}MB"
+        )
+
+
+async def _read_upload(file: UploadFile) -> bytes:
+    """Read an uploaded file, enforcing the size limit.
+
+    Args:
+        file: Uploaded image file
+
+    Returns:
+        File contents
+
+    Raises:
+        HTTPException: If the file cannot be read or is too large
+    """
+    # Read file in chunks, stopping as soon as the size limit is exceeded
+    buffer = bytearray()
     try:
-        image_bytes = await file.read()
+        while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+            buffer.extend(chunk)
+            if len(buffer) > settings.MAX_FILE_SIZE:
+                break
     except Exception as e:
         logger.error(f"Failed to read uploaded file: {e}")
         raise HTTPException(
@@ -147,45 +319,119 @@ async def extract_event_data(
         )
 
     # Validate file size
-    if len(image_bytes) > settings.MAX_FILE_SIZE:
+    if len(buffer) > settings.MAX_FILE_SIZE:
         raise HTTPException(
             status_code=400,
-            detail=f"File too large: {len(image_bytes) / 1024 / 1024:.1f}MB. "
+            detail=f"File too large. "
                    f"Maximum size: {settings.MAX_FILE_SIZE / 1024 / 1024}MB"
         )
 
-    # Validate force_route parameter
-    if force_route and force_route not in ['ocr_first', 'vision']:
-        raise HTTPException(
-            status_code=400,
-            detail=f"Invalid force_route value: '{force_route}'. "
-                   f"Must be 'ocr_first' or 'vision'"
-        )
+    return bytes(buffer)
 
-    # Process image through pipeline
+
+def _create_adapter(
+    request: Request,
+    provider: str,
+    api_key: Optional[str]
+) -> LLMAdapter:
+    """Create (or reuse) an LLM adapter for a request.
+
+    Args:
+        request: Incoming request (for app-wide shared resources)
+        provider: LLM provider name
+        api_key: User-provided API key (falls back to the configured key)
+
+    Returns:
+        LLM adapter
+
+    Raises:
+        HTTPException: If the adapter cannot be created
+    """
+    # Create LLM adapter with user-provided API key
     try:
-        result = await pipeline.process(
-            image_bytes,
-            {
-                'lang': lang,
-                'timezone': timezone,
-                'force_route': force_route
-            }
-        )
+        # Use user-provided key or fall back to env (for backward compatibility)
+        final_api_key = api_key or (settings.LLM_API_KEY if settings.LLM_API_KEY else None)
 
-        return JSONResponse(content=result)
+        if not final_api_key and provider != "mock":
+            raise HTTPException(
+                status_code=400,
+                detail="API key is required. Please provide your Gemini API key."
+            )
 
+        llm_adapter = create_llm_adapter(
+            provider=provider,
+            api_key=final_api_key,
+            model=None,
+            http_client=getattr(request.app.state, "http", None),
+            cache=getattr(request.app.state, "llm_cache", None)
+        )
     except ValueError as e:
-        # Handle validation/processing errors
-        logger.warning(f"Extraction validation error: {e}")
+        # Handle factory errors (unknown provider, missing key)
         raise HTTPException(
             status_code=400,
             detail=str(e)
         )
     except Exception as e:
-        # Handle unexpected errors
-        logger.error(f"Extraction failed with error: {e}", exc_info=True)
+        # Handle API authentication errors
+        error_msg = str(e).lower()
+        if "api key" in error_msg or "authentication" in error_msg or "unauthorized" in error_msg:
+            raise HTTPException(
+                status_code=401,
+                detail="Invalid API key. Please check your Gemini API key."
+            )
+        logger.error(f"Failed to create LLM adapter: {e}")
         raise HTTPException(
             status_code=500,
-            detail=f"Extraction failed: {str(e)}"
+            detail=f"Failed to initialize LLM provider: {str(e)}"
+        )
+
+    return llm_adapter
+
+
+def _create_pipeline(
+    request: Request,
+    provider: str,
+    api_key: Optional[str],
+    default_adapter: Optional[LLMAdapter] = None
+) -> ExtractionPipeline:
+    """Create an extraction pipeline with a request-specific LLM adapter.
+
+    Args:
+        request: Incoming request (for app-wide shared resources)
+        provider: LLM provider name
+        api_key: User-provided API key (falls back to the configured key)
+        default_adapter: Adapter built at startup, used when no key is given
+
+    Returns:
+        Extraction pipeline
+
+    Raises:
+        HTTPException: If the adapter or pipeline cannot be created
+    """
+    if not api_key and default_adapter is not None and default_adapter.provider == provider.lower():
+        # Requests without their own key share the startup adapter
+        llm_adapter = default_adapter
+    else:
+        llm_adapter = _create_adapter(request, provider, api_key)
+
+    # Create pipeline with request-specific adapter
+    try:
+        pipeline = ExtractionPipeline(
+            llm_adapter,
+            ocr_extractor,
+            settings,
+            preprocessor=preprocessor,
+            complexity_scorer=complexity_scorer,
+            route_decider=route_decider,
+            normalizer=normalizer,
+            validator=validator,
+            batcher=getattr(request.app.state, "batcher", None)
         )
+    except Exception as e:
+        logger.error(f"Failed to initialize pipeline: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to initialize extraction pipeline: {str(e)}"
+        )
+
+    return pipeline
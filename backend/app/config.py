@@ -1,8 +1,8 @@
 """Configuration management using Pydantic settings."""
 
-from typing import List
+from typing import FrozenSet, List
 from pydantic_settings import BaseSettings
-from functools import lru_cache
+from functools import cached_property, lru_cache
 
 
 class Settings(BaseSettings):
@@ -19,18 +19,64 @@ class Settings(BaseSettings):
 
     # OCR Configuration
     OCR_DEFAULT_LANG: str = "en"
+    OCR_LANGS: List[str] = ["en", "ch", "chinese_cht", "japan", "korean", "fr", "de", "es", "it", "pt", "ru", "ar", "hi"]  # Accepted lang codes; each loads its own models
     PADDLEOCR_MODEL_DIR: str = "models"
 
     # Image Preprocessing
     PREPROCESS_MAX_DIM: int = 2000
+    # Max size of the grayscale OCR image; capped at PREPROCESS_MAX_DIM, so the default is a no-op. Lower it
+    # (e.g. 1600) only when preprocessing CPU is the bottleneck and OCR accuracy on your posters has been
+    # checked at that size: denoise/CLAHE cost scales with area, but small text may stop being recognized
+    OCR_MAX_DIM: int = 2000
     CLAHE_CLIP_LIMIT: float = 2.0
     CLAHE_GRID_SIZE: tuple = (8, 8)
+    DENOISE_METHOD: str = "bilateral"  # bilateral (exact), guided (constant-time)
+    OCR_BINARIZE: bool = False  # Sauvola binarization instead of CLAHE + denoise
+    PREPROCESS_BACKEND: str = "opencv"  # opencv, numba (parallel CLAHE; fused with bilateral denoise)
+    PREPROCESS_DEVICE: str = "cpu"  # cpu, cuda (needs a CUDA build of OpenCV; falls back to cpu)
+    PREPROCESS_WORKERS: int = 0  # Preprocessing threads; 0 = one per CPU core
+    PREPROCESS_CACHE_MB: int = 256  # Memory for cached preprocessing results; 0 disables
+    # OpenCV threads per preprocessing call; -1 = OpenCV default (one per core), 0 = no internal threading.
+    # Parallelism already comes from PREPROCESS_WORKERS, so OpenCV's own per-core threads on top of a
+    # per-core pool would run ~cores² threads; raise this only when PREPROCESS_WORKERS is small
+    OCV_THREADS: int = 1
 
     # Complexity Scoring Thresholds
+    # Score edge/text density on a thumbnail this size; 0 = full size. The weights and COMPLEXITY_THRESHOLD
+    # below are calibrated at full size, so only set this (e.g. 512) when scoring shows up as a bottleneck
+    # on large uploads, and retune them on sample traffic first so the OCR/vision split stays the same
+    COMPLEXITY_MAX_DIM: int = 0
     BLUR_THRESHOLD: float = 100.0
     EDGE_WEIGHT: float = 0.4
     TEXT_WEIGHT: float = 0.6
     COMPLEXITY_THRESHOLD: float = 0.7  # Threshold for routing to vision
+    COMPLEXITY_SPEC_BAND: tuple = (0.5, 0.7)  # Borderline scores run OCR and vision concurrently
+
+    # Vision Request Batching (groups concurrent uploads into one LLM call)
+    VISION_BATCH_ENABLED: bool = False
+    VISION_BATCH_INTERVAL: float = 0.05  # Seconds to wait for more requests
+    VISION_BATCH_MAX: int = 8
+
+    # Outbound HTTP Connection Pool (shared by all LLM adapters)
+    HTTP_MAX_CONNECTIONS: int = 100
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 32
+    HTTP_KEEPALIVE_EXPIRY: float = 75.0  # Seconds an idle connection is kept open
+
+    # LLM Result Cache (SQLite file per host; opt-in)
+    LLM_CACHE_ENABLED: bool = False
+    CACHE_DIR: str = ".cache"  # Relative paths resolve against the working directory
+    LLM_CACHE_TTL: int = 7 * 24 * 60 * 60  # 7 days in seconds
+
+    # LLM Response Cache (per adapter call, shared across workers via Redis)
+    LLM_RESPONSE_CACHE_ENABLED: bool = False
+    LLM_RESPONSE_CACHE_TTL: int = 24 * 60 * 60  # 1 day in seconds
+    LLM_RESPONSE_CACHE_MAX_ENTRIES: int = 1024  # In-memory backend capacity
+    REDIS_URL: str = ""  # e.g. redis://localhost:6379/0 (requires redis)
+
+    # Server (used when running `python -m app.main`)
+    SERVER_RELOAD: bool = False  # Development auto-reload (set true locally); forces a single worker
+    SERVER_WORKERS: int = 0  # 0 = max(2, CPU count)
+    SERVER_KEEPALIVE_TIMEOUT: int = 75  # Seconds, matches HTTP_KEEPALIVE_EXPIRY
 
     # CORS Configuration
     CORS_ORIGINS: List[str] = ["http://localhost:3000", "http://localhost:3001"]
@@ -39,6 +85,16 @@ class Settings(BaseSettings):
     MAX_FILE_SIZE: int = 10 * 1024 * 1024  # 10MB in bytes
     ALLOWED_CONTENT_TYPES: List[str] = ["image/jpeg", "image/png", "image/webp"]
 
+    @cached_property
+    def allowed_content_types_set(self) -> FrozenSet[str]:
+        """Allowed upload content types as a set for O(1) membership checks."""
+        return frozenset(self.ALLOWED_CONTENT_TYPES)
+
+    @cached_property
+    def ocr_langs_set(self) -> FrozenSet[str]:
+        """Accepted OCR languages as a set for O(1) membership checks."""
+        return frozenset(self.OCR_LANGS)
+
     class Config:
         """Pydantic configuration."""
         env_file = ".env"
@@ -0,0 +1,132 @@
+"""Content-addressable cache for LLM extraction results."""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+DEFAULT_TTL = 7 * 24 * 60 * 60  # 7 days in seconds
+
+
+def hash_image(image_bytes: bytes) -> str:
+    """Hash image bytes for use in a cache key.
+
+    The length is hashed as a prefix so that inputs of different sizes
+    can never share a digest stream.
+
+    Args:
+        image_bytes: Raw image bytes
+
+    Returns:
+        Hex-encoded SHA-256 digest
+    """
+    hasher = hashlib.sha256(len(image_bytes).to_bytes(8, "little"))
+    hasher.update(image_bytes)
+    return hasher.hexdigest()
+
+
+class LLMResultCache:
+    """SQLite-backed cache of extraction results with per-entry expiry."""
+
+    def __init__(self, cache_dir: str):
+        """Open (or create) the cache database.
+
+        Args:
+            cache_dir: Directory where the SQLite file is stored
+        """
+        path = Path(cache_dir)
+        path.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            str(path / "llm_cache.sqlite3"),
+            check_same_thread=False
+        )
+
+        with self._lock:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS llm_cache_expires_at ON llm_cache (expires_at)"
+            )
+            self._conn.commit()
+
+    @staticmethod
+    def _digest(key: Tuple) -> str:
+        """Collapse a key tuple into a fixed-size primary key."""
+        return hashlib.sha256(json.dumps(list(key)).encode("utf-8")).hexdigest()
+
+    def get(self, key: Tuple) -> Optional[Dict[str, Any]]:
+        """Look up a cached result.
+
+        Args:
+            key: Cache key tuple
+
+        Returns:
+            Cached result, or None on miss or expiry
+        """
+        digest = self._digest(key)
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM llm_cache WHERE key = ?",
+                (digest,)
+            ).fetchone()
+
+            if row is None:
+                return None
+
+            value, expires_at = row
+            if expires_at < time.time():
+                self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (digest,))
+                self._conn.commit()
+                return None
+
+        return json.loads(value)
+
+    def set(self, key: Tuple, value: Dict[str, Any], ttl: int = DEFAULT_TTL) -> None:
+        """Store a result and purge expired entries.
+
+        Args:
+            key: Cache key tuple
+            value: JSON-serializable result
+            ttl: Time to live in seconds
+        """
+        now = time.time()
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, value, expires_at) VALUES (?, ?, ?)",
+                (self._digest(key), json.dumps(value), now + ttl)
+            )
+            self._conn.execute("DELETE FROM llm_cache WHERE expires_at < ?", (now,))
+            self._conn.commit()
+
+    def delete(self, key: Tuple) -> None:
+        """Evict a single entry.
+
+        Args:
+            key: Cache key tuple
+        """
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (self._digest(key),))
+            self._conn.commit()
+
+
+@lru_cache()
+def get_llm_cache(cache_dir: str) -> LLMResultCache:
+    """Get the shared cache instance for a directory.
+
+    Args:
+        cache_dir: Directory where the SQLite file is stored
+
+    Returns:
+        LLMResultCache: Cached instance
+    """
+    return LLMResultCache(cache_dir)
@@ -1,16 +1,21 @@
 """Main extraction pipeline orchestration."""
 
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Tuple
+import asyncio
 import logging
 
+from pydantic import ValidationError
+
 from app.config import Settings
 from app.preprocessing.image_processor import ImageProcessor
 from app.preprocessing.complexity_scorer import ComplexityScorer, RouteDecider
 from app.extractors.ocr_extractor import OCRExtractor
-from app.llm.base import LLMAdapter
+from app.llm.base import FieldCallback, LLMAdapter, PROMPT_VERSION
+from app.llm.batcher import AsyncBatcher
 from app.postprocessing.normalizer import FieldNormalizer
 from app.postprocessing.validator import FieldValidator
 from app.core.schemas import ExtractionResponse, ComplexityScore
+from app.core.llm_cache import LLMResultCache, get_llm_cache, hash_image
 
 logger = logging.getLogger(__name__)
 
@@ -22,64 +27,106 @@ class ExtractionPipeline:
         self,
         llm_adapter: LLMAdapter,
         ocr_extractor: OCRExtractor,
-        config: Settings
+        config: Settings,
+        preprocessor: Optional[ImageProcessor] = None,
+        complexity_scorer: Optional[ComplexityScorer] = None,
+        route_decider: Optional[RouteDecider] = None,
+        normalizer: Optional[FieldNormalizer] = None,
+        validator: Optional[FieldValidator] = None,
+        batcher: Optional[AsyncBatcher] = None
     ):
         """Initialize extraction pipeline.
 
+        Components that are not passed in are created from config. Callers
+        building a pipeline per request should pass shared instances.
+
         Args:
             llm_adapter: LLM adapter for text/vision extraction
             ocr_extractor: OCR extractor instance
             config: Application settings
+            preprocessor: Image preprocessor
+            complexity_scorer: Complexity scorer
+            route_decider: Route decider
+            normalizer: Field normalizer
+            validator: Field validator
+            batcher: Vision request batcher (optional)
         """
         self.llm_adapter = llm_adapter
         self.ocr_extractor = ocr_extractor
         self.config = config
 
         # Initialize components
-        self.preprocessor = ImageProcessor(config)
-        self.complexity_scorer = ComplexityScorer(config)
-        self.route_decider = RouteDecider(config)
-        self.normalizer = FieldNormalizer()
-        self.validator = FieldValidator()
+        self.preprocessor = preprocessor or ImageProcessor(config)
+        self.complexity_scorer = complexity_scorer or ComplexityScorer(config)
+        self.route_decider = route_decider or RouteDecider(config)
+        self.normalizer = normalizer or FieldNormalizer()
+        self.validator = validator or FieldValidator()
+        self.batcher = batcher
+        self.result_cache: Optional[LLMResultCache] = (
+            get_llm_cache(config.CACHE_DIR) if config.LLM_CACHE_ENABLED else None
+        )
 
     async def process(
         self,
         image_bytes: bytes,
-        params: Dict[str, Any]
+        params: Dict[str, Any],
+        on_field: Optional[FieldCallback] = None
     ) -> Dict[str, Any]:
         """Process image through full extraction pipeline.
 
         Pipeline stages:
-        1. Preprocess image
-        2. Calculate complexity score
+        1. Preprocess image (skipped when vision is forced)
+        2. Calculate complexity score (skipped when vision is forced)
         3. Decide route (or use forced route)
-        4. Extract via OCR-first or Vision route
-        5. Fallback to Vision if OCR insufficient
-        6. Normalize fields
-        7. Validate and add warnings
+        4. Return cached result if the same request was already extracted
+        5. Extract via OCR-first or Vision route
+        6. Fallback to Vision if OCR insufficient
+        7. Normalize fields
+        8. Validate and add warnings
 
         Args:
             image_bytes: Raw image bytes
             params: Extraction parameters (lang, timezone, force_route)
+            on_field: Awaited with each raw LLM field as it streams in
+                (optional). Streaming disables the speculative route, and a
+                vision fallback reports its fields again.
 
         Returns:
             Complete extraction result
         """
         logger.info("Starting extraction pipeline")
 
-        # 1. Preprocess image
-        try:
-            processed_img, original_img = self.preprocessor.process(image_bytes)
-        except Exception as e:
-            logger.error(f"Preprocessing failed: {e}")
-            raise ValueError(f"Image preprocessing failed: {e}")
+        force_route = params.get('force_route')
 
-        # 2. Calculate complexity score
-        complexity = self.complexity_scorer.calculate(processed_img)
-        logger.info(f"Complexity score: {complexity.overall_complexity:.2f}")
+        if force_route == "vision":
+            # Vision sends the raw bytes to the LLM, so preprocessing and
+            # scoring would be thrown away
+            processed_img = original_img = None
+            complexity = ComplexityScore(
+                blur_variance=0.0,
+                edge_density=0.0,
+                text_density=0.0,
+                overall_complexity=1.0,
+                is_blurry=False
+            )
+        else:
+            # 1. Preprocess image
+            try:
+                processed_img, original_img = await self.preprocessor.process_async(
+                    image_bytes
+                )
+            except Exception as e:
+                logger.error(f"Preprocessing failed: {e}")
+                raise ValueError(f"Image preprocessing failed: {e}")
+
+            # 2. Calculate complexity score
+            complexity = await asyncio.to_thread(
+                self.complexity_scorer.calculate,
+                processed_img
+            )
+            logger.info(f"Complexity score: {complexity.overall_complexity:.2f}")
 
         # 3. Decide route
-        force_route = params.get('force_route')
         if force_route:
             route = force_route
             logger.info(f"Using forced route: {route}")
@@ -87,40 +134,154 @@ class ExtractionPipeline:
             route = self.route_decider.decide(complexity)
             logger.info(f"Decided route: {route}")
 
-        # 4. Extract based on route
-        if route == "ocr_first":
+        # Serialize the score once; every route embeds the same payloads
+        complexity_dict = complexity.model_dump()
+        debug = {
+            'blur': complexity.blur_variance,
+            'edge_density': complexity.edge_density
+        }
+
+        # 4. Check result cache
+        cache_key = self._cache_key(image_bytes, params, route)
+        cached = await self._get_cached(cache_key)
+        if cached is not None:
+            logger.info(f"Returning cached extraction. Route: {cached.get('route')}")
+            return cached
+
+        # 5. Extract based on route
+        spec_low, spec_high = self.config.COMPLEXITY_SPEC_BAND
+        speculative = (
+            not force_route
+            and on_field is None
+            and not complexity.is_blurry
+            and spec_low <= complexity.overall_complexity <= spec_high
+        )
+
+        if speculative:
+            result = await self._speculative_route(
+                processed_img,
+                original_img,
+                image_bytes,
+                params,
+                complexity_dict,
+                debug
+            )
+        elif route == "ocr_first":
             result = await self._ocr_first_route(
                 processed_img,
                 original_img,
                 image_bytes,
                 params,
-                complexity
+                complexity_dict,
+                debug,
+                on_field=on_field
             )
         else:
             result = await self._vision_route(
                 image_bytes,
                 params,
-                complexity
+                complexity_dict,
+                debug,
+                on_field=on_field
             )
 
-        # 5. Normalize fields
+        # 6. Normalize fields
         result = self.normalizer.normalize(result)
 
-        # 6. Validate and add warnings
+        # 7. Validate and add warnings
         result = self.validator.validate(result)
 
         logger.info(f"Extraction complete. Route: {result.get('route')}, Confidence: {result.get('confidence')}")
 
+        await self._set_cached(cache_key, result)
+
         return result
 
+    def _cache_key(
+        self,
+        image_bytes: bytes,
+        params: Dict[str, Any],
+        route: str
+    ) -> Tuple:
+        """Build the result cache key for a request.
+
+        Args:
+            image_bytes: Raw image bytes
+            params: Extraction parameters
+            route: Extraction route
+
+        Returns:
+            Key tuple identifying the LLM request
+        """
+        # The key hash keeps one caller's results from being served to a
+        # request with a different (or invalid) API key
+        return (
+            self.llm_adapter.provider,
+            self.llm_adapter.key_hash,
+            self.llm_adapter.model,
+            PROMPT_VERSION,
+            hash_image(image_bytes),
+            params.get('lang', 'en'),
+            params.get('timezone', 'UTC'),
+            route
+        )
+
+    async def _get_cached(self, cache_key: Tuple) -> Optional[Dict[str, Any]]:
+        """Fetch a cached result, evicting it if it no longer validates.
+
+        SQLite calls run in a worker thread so they never block the event loop.
+
+        Args:
+            cache_key: Result cache key
+
+        Returns:
+            Cached extraction result or None
+        """
+        if self.result_cache is None:
+            return None
+
+        cached = await asyncio.to_thread(self.result_cache.get, cache_key)
+        if cached is None:
+            return None
+
+        try:
+            ExtractionResponse.model_validate(cached)
+        except ValidationError:
+            logger.warning("Evicting cached extraction that failed validation")
+            await asyncio.to_thread(self.result_cache.delete, cache_key)
+            return None
+
+        return cached
+
+    async def _set_cached(self, cache_key: Tuple, result: Dict[str, Any]) -> None:
+        """Store a successful extraction result.
+
+        Args:
+            cache_key: Result cache key
+            result: Final extraction result
+        """
+        if self.result_cache is None or 'error' in result:
+            return
+
+        try:
+            ExtractionResponse.model_validate(result)
+        except ValidationError:
+            logger.info("Not caching extraction that does not match the response schema")
+            return
+
+        await asyncio.to_thread(self.result_cache.set, cache_key, result, self.config.LLM_CACHE_TTL)
+
     async def _ocr_first_route(
         self,
         processed_img,
         original_img,
         image_bytes: bytes,
         params: Dict[str, Any],
-        complexity: ComplexityScore
-    ) -> Dict[str, Any]:
+        complexity_dict: Dict[str, Any],
+        debug: Dict[str, float],
+        fallback: bool = True,
+        on_field: Optional[FieldCallback] = None
+    ) -> Optional[Dict[str, Any]]:
         """Execute OCR-first extraction route with fallback.
 
         Args:
@@ -128,123 +289,227 @@ class ExtractionPipeline:
             original_img: Original color image
             image_bytes: Raw image bytes (for vision fallback)
             params: Extraction parameters
-            complexity: Complexity score
+            complexity_dict: Serialized complexity score
+            debug: Complexity debug values for the raw payload
+            fallback: Fall back to vision when OCR extraction fails or is
+                insufficient. When False, returns None on LLM errors and the
+                unchecked OCR result otherwise.
+            on_field: Field callback for the LLM calls (optional)
 
         Returns:
             Extraction result
         """
         logger.info("Executing OCR-first route")
 
-        # Run OCR
-        ocr_result = self.ocr_extractor.extract(
+        # Run OCR off the event loop
+        ocr_result = await asyncio.to_thread(
+            self.ocr_extractor.extract,
             processed_img,
-            lang=params.get('lang', 'en')
+            params.get('lang', 'en')
         )
 
+        # Blocks are plain dicts, shared by the LLM call and the raw payload
+        blocks_dump = ocr_result['blocks']
+
         # Extract structured data from OCR text using LLM
+        llm_task = asyncio.create_task(self.llm_adapter.text_to_json(
+            ocr_result['text'],
+            blocks_dump,
+            timezone=params.get('timezone', 'UTC'),
+            on_field=on_field
+        ))
+
         try:
-            llm_result = await self.llm_adapter.text_to_json(
-                ocr_result['text'],
-                [block.model_dump() for block in ocr_result['blocks']],
-                timezone=params.get('timezone', 'UTC')
-            )
+            # Let the LLM request go out, then build the raw payload while
+            # the response is in flight
+            await asyncio.sleep(0)
+            raw = {
+                'ocr_text': ocr_result['text'],
+                'layout_blocks': blocks_dump,
+                'debug': {**debug, 'cc_count': len(blocks_dump)}
+            }
+
+            llm_result = await llm_task
 
             # Check if LLM returned an error
             if 'error' in llm_result:
-                print(f"\n[PIPELINE] LLM returned error, falling back to vision: {llm_result['error']}\n")
                 logger.error(f"LLM text_to_json returned error: {llm_result['error']}")
+                if not fallback:
+                    return None
                 # Fallback to vision on LLM error
-                return await self._vision_route(image_bytes, params, complexity, route_override="ocr_fallback_vision")
+                return await self._vision_route(image_bytes, params, complexity_dict, debug, route_override="ocr_fallback_vision", on_field=on_field)
+        except asyncio.CancelledError:
+            llm_task.cancel()
+            raise
         except Exception as e:
-            print(f"\n[PIPELINE] Exception in text_to_json, falling back to vision: {e}\n")
             logger.error(f"LLM text_to_json failed: {e}")
+            if not fallback:
+                return None
             # Fallback to vision on LLM error
-            return await self._vision_route(image_bytes, params, complexity, route_override="ocr_fallback_vision")
+            return await self._vision_route(image_bytes, params, complexity_dict, debug, route_override="ocr_fallback_vision", on_field=on_field)
 
         # Build result
         result = {
             'type': 'event_poster',
             'route': 'ocr_first',
-            'complexity_score': complexity.model_dump(),
+            'complexity_score': complexity_dict,
             'fields': llm_result.get('fields', {}),
             'extra': llm_result.get('extra', []),
-            'raw': {
-                'ocr_text': ocr_result['text'],
-                'layout_blocks': [block.model_dump() for block in ocr_result['blocks']],
-                'debug': {
-                    'blur': complexity.blur_variance,
-                    'edge_density': complexity.edge_density,
-                    'cc_count': len(ocr_result['blocks'])
-                }
-            }
+            'raw': raw
         }
 
         # Check if fallback to vision is needed
-        if not self.validator.is_extraction_sufficient(result):
+        if fallback and not self.validator.is_extraction_sufficient(result):
             logger.info("OCR extraction insufficient, falling back to vision")
             return await self._vision_route(
                 image_bytes,
                 params,
-                complexity,
+                complexity_dict,
+                debug,
                 route_override="ocr_fallback_vision",
-                preserve_ocr=result['raw']
+                preserve_ocr=result['raw'],
+                on_field=on_field
             )
 
         return result
 
+    async def _speculative_route(
+        self,
+        processed_img,
+        original_img,
+        image_bytes: bytes,
+        params: Dict[str, Any],
+        complexity_dict: Dict[str, Any],
+        debug: Dict[str, float]
+    ) -> Dict[str, Any]:
+        """Race the OCR-first and vision routes for borderline images.
+
+        Both routes start immediately. A sufficient OCR result that finishes
+        first wins and the vision call is cancelled; otherwise the vision
+        result is used, so fallback costs no extra round trip.
+
+        Args:
+            processed_img: Preprocessed grayscale image
+            original_img: Original color image
+            image_bytes: Raw image bytes
+            params: Extraction parameters
+            complexity_dict: Serialized complexity score
+            debug: Complexity debug values for the raw payload
+
+        Returns:
+            Extraction result
+        """
+        logger.info("Executing speculative OCR-first and vision routes")
+
+        ocr_task = asyncio.create_task(self._ocr_first_route(
+            processed_img,
+            original_img,
+            image_bytes,
+            params,
+            complexity_dict,
+            debug,
+            fallback=False
+        ))
+        vision_task = asyncio.create_task(self._vision_route(
+            image_bytes,
+            params,
+            complexity_dict,
+            debug
+        ))
+
+        try:
+            done, _ = await asyncio.wait(
+                {ocr_task, vision_task},
+                return_when=asyncio.FIRST_COMPLETED
+            )
+
+            if vision_task in done and 'error' not in vision_task.result():
+                logger.info("Vision route finished first")
+                return vision_task.result()
+
+            ocr_result = await ocr_task
+            if ocr_result is not None and self.validator.is_extraction_sufficient(ocr_result):
+                logger.info("OCR route sufficient, cancelling vision route")
+                return ocr_result
+
+            result = await vision_task
+            if 'error' in result and ocr_result is not None:
+                logger.info("Vision route failed, using OCR result")
+                return ocr_result
+
+            logger.info("OCR extraction insufficient, using vision result")
+            result['route'] = "ocr_fallback_vision"
+            if ocr_result is not None:
+                result['raw'] = ocr_result['raw']
+            return result
+        finally:
+            for task in (ocr_task, vision_task):
+                if not task.done():
+                    task.cancel()
+
     async def _vision_route(
         self,
         image_bytes: bytes,
         params: Dict[str, Any],
-        complexity: ComplexityScore,
+        complexity_dict: Dict[str, Any],
+        debug: Dict[str, float],
         route_override: str = None,
-        preserve_ocr: Dict = None
+        preserve_ocr: Dict = None,
+        on_field: Optional[FieldCallback] = None
     ) -> Dict[str, Any]:
         """Execute vision-based extraction route.
 
         Args:
             image_bytes: Raw image bytes
             params: Extraction parameters
-            complexity: Complexity score
+            complexity_dict: Serialized complexity score
+            debug: Complexity debug values for the raw payload
             route_override: Override route name (for fallback)
             preserve_ocr: OCR data to preserve from failed route
+            on_field: Field callback for the LLM call (optional, bypasses
+                the batcher since batched calls cannot stream)
 
         Returns:
             Extraction result
         """
         route_name = route_override or "vision"
-        print(f"\n[PIPELINE] Executing vision route: {route_name}\n")
         logger.info(f"Executing vision route (route={route_name})")
 
         # Extract using vision LLM
         try:
-            llm_result = await self.llm_adapter.image_to_json(
-                image_bytes,
-                timezone=params.get('timezone', 'UTC')
-            )
+            if self.batcher is not None and on_field is None:
+                llm_result = await self.batcher.submit(
+                    self.llm_adapter,
+                    image_bytes,
+                    timezone=params.get('timezone', 'UTC')
+                )
+            else:
+                llm_result = await self.llm_adapter.image_to_json(
+                    image_bytes,
+                    timezone=params.get('timezone', 'UTC'),
+                    on_field=on_field
+                )
 
             # Check if LLM returned an error
             if 'error' in llm_result:
-                print(f"\n[PIPELINE] Vision LLM returned error: {llm_result['error']}\n")
                 logger.error(f"LLM image_to_json returned error: {llm_result['error']}")
                 # If vision also fails, return error
                 return {
                     'type': 'event_poster',
                     'route': route_name,
-                    'complexity_score': complexity.model_dump(),
+                    'complexity_score': complexity_dict,
                     'fields': {},
                     'extra': [],
                     'raw': preserve_ocr,
                     'error': llm_result['error']
                 }
         except Exception as e:
-            print(f"\n[PIPELINE] Exception in image_to_json: {e}\n")
             logger.error(f"LLM image_to_json failed: {e}")
             # If vision also fails, return error
             return {
                 'type': 'event_poster',
                 'route': route_name,
-                'complexity_score': complexity.model_dump(),
+                'complexity_score': complexity_dict,
                 'fields': {},
                 'extra': [],
                 'raw': preserve_ocr,
@@ -255,15 +520,10 @@ class ExtractionPipeline:
         result = {
             'type': 'event_poster',
             'route': route_name,
-            'complexity_score': complexity.model_dump(),
+            'complexity_score': complexity_dict,
             'fields': llm_result.get('fields', {}),
             'extra': llm_result.get('extra', []),
-            'raw': preserve_ocr or {
-                'debug': {
-                    'blur': complexity.blur_variance,
-                    'edge_density': complexity.edge_density
-                }
-            }
+            'raw': preserve_ocr or {'debug': debug}
         }
 
         return result
@@ -1,11 +1,50 @@
 """OCR extraction using PaddleOCR."""
 
+import threading
 import numpy as np
 from typing import Dict, List
 from paddleocr import PaddleOCR
 
 from app.config import Settings
-from app.core.schemas import LayoutBlock
+
+# PaddleOCR predictors are not thread-safe; engines are shared across requests
+_ocr_lock = threading.Lock()
+
+# One engine per language, created on first use
+_engines: Dict[str, PaddleOCR] = {}
+_engines_lock = threading.Lock()
+
+
+def _get_paddle(lang: str) -> PaddleOCR:
+    """Get a shared PaddleOCR instance for a language.
+
+    Models are loaded once per language and reused across requests
+    (they auto-download on first run to ~/.paddleocr/). Callers must check
+    lang against OCR_LANGS first, which bounds the number of engines.
+
+    Args:
+        lang: Language code
+
+    Returns:
+        PaddleOCR: Cached OCR engine
+    """
+    engine = _engines.get(lang)
+    if engine is not None:
+        return engine
+
+    # Concurrent first requests must not each load the models
+    with _engines_lock:
+        engine = _engines.get(lang)
+        if engine is None:
+            engine = PaddleOCR(
+                use_angle_cls=True,  # Enable text orientation detection
+                lang=lang,
+                use_gpu=False,  # Set to True if CUDA is available
+                show_log=False
+            )
+            _engines[lang] = engine
+
+    return engine
 
 
 class OCRExtractor:
@@ -19,14 +58,6 @@ class OCRExtractor:
         """
         self.config = config
 
-        # Initialize PaddleOCR (models auto-download on first run to ~/.paddleocr/)
-        self.ocr = PaddleOCR(
-            use_angle_cls=True,  # Enable text orientation detection
-            lang=config.OCR_DEFAULT_LANG,
-            use_gpu=False,  # Set to True if CUDA is available
-            show_log=False
-        )
-
     def extract(self, img: np.ndarray, lang: str = None) -> Dict:
         """Extract text and layout information from image.
 
@@ -36,21 +67,21 @@ class OCRExtractor:
 
         Returns:
             Dictionary with 'text', 'blocks', and 'raw' fields
+
+        Raises:
+            ValueError: If the language is not in OCR_LANGS
         """
         # Use provided language or default
-        if lang and lang != self.config.OCR_DEFAULT_LANG:
-            # Reinitialize OCR with different language
-            self.ocr = PaddleOCR(
-                use_angle_cls=True,
-                lang=lang,
-                use_gpu=False,
-                show_log=False
-            )
+        lang = lang or self.config.OCR_DEFAULT_LANG
+        if lang not in self.config.ocr_langs_set:
+            raise ValueError(f"Unsupported OCR language: '{lang}'")
+        ocr = _get_paddle(lang)
 
         # Run OCR
         # PaddleOCR returns: [[[bbox], (text, confidence)], ...]
         try:
-            result = self.ocr.ocr(img, cls=True)
+            with _ocr_lock:
+                result = ocr.ocr(img, cls=True)
         except Exception as e:
             # Handle OCR failures gracefully
             return {
@@ -67,28 +98,30 @@ class OCRExtractor:
                 'raw': []
             }
 
-        # Parse OCR results
-        blocks = []
-        full_text_parts = []
-
-        for line in result[0]:
-            bbox, (text, confidence) = line
-
-            # Create LayoutBlock
-            block = LayoutBlock(
-                text=text,
-                conf=float(confidence),
-                bbox=[[int(x), int(y)] for x, y in bbox],
-                position=self._get_region(bbox, img.shape)
-            )
-            blocks.append(block)
-            full_text_parts.append(text)
-
-        # Sort blocks by reading order (top-to-bottom, left-to-right)
-        blocks = self._sort_blocks(blocks)
+        # Parse OCR results into per-attribute arrays: points is (N, 4, 2)
+        lines = result[0]
+        points = np.asarray([line[0] for line in lines], dtype=np.float32)
+        bboxes = points.astype(np.int32)
+        texts = [line[1][0] for line in lines]
+        confidences = [float(line[1][1]) for line in lines]
+
+        order = self._reading_order(bboxes)
+        regions = self._get_regions(points, img.shape)
+
+        # Create layout blocks in reading order as plain dicts in the
+        # schemas.LayoutBlock shape (no per-block Pydantic validation)
+        blocks = [
+            {
+                'text': texts[i],
+                'conf': confidences[i],
+                'bbox': bboxes[i].tolist(),
+                'position': regions[i]
+            }
+            for i in order
+        ]
 
         # Join text from sorted blocks
-        full_text = '\n'.join([block.text for block in blocks])
+        full_text = '\n'.join([block['text'] for block in blocks])
 
         return {
             'text': full_text,
@@ -96,50 +129,47 @@ class OCRExtractor:
             'raw': result
         }
 
-    def _sort_blocks(self, blocks: List[LayoutBlock]) -> List[LayoutBlock]:
-        """Sort text blocks in reading order (top-to-bottom, left-to-right).
+    def _reading_order(self, bboxes: np.ndarray) -> np.ndarray:
+        """Compute reading order (top-to-bottom, left-to-right) of text blocks.
 
         Args:
-            blocks: List of layout blocks
+            bboxes: Bounding boxes, shape (N, 4, 2)
 
         Returns:
-            Sorted list of blocks
+            Indices of blocks in reading order
         """
-        # Sort by y-coordinate (top edge), then x-coordinate (left edge)
-        return sorted(
-            blocks,
-            key=lambda b: (b.bbox[0][1], b.bbox[0][0])
-        )
+        # Sort by top edge, then left edge
+        top_y = bboxes[:, :, 1].min(axis=1)
+        left_x = bboxes[:, :, 0].min(axis=1)
+        return np.lexsort((left_x, top_y))
 
-    def _get_region(self, bbox: List[List[int]], img_shape: tuple) -> str:
-        """Determine if text is in top/middle/bottom region of image.
+    def _get_regions(self, points: np.ndarray, img_shape: tuple) -> List[str]:
+        """Determine if each text block is in the top/middle/bottom region of image.
 
         Args:
-            bbox: Bounding box coordinates
+            points: Bounding box coordinates, shape (N, 4, 2)
             img_shape: Image shape (height, width)
 
         Returns:
-            Region string: "top", "middle", or "bottom"
+            Region strings: "top", "middle", or "bottom"
         """
-        # Calculate center y-coordinate of bounding box
-        y_coords = [point[1] for point in bbox]
-        y_center = np.mean(y_coords)
+        # Calculate center y-coordinate of each bounding box
+        y_center = points[:, :, 1].mean(axis=1)
 
         # Divide image into thirds
         height = img_shape[0]
 
-        if y_center < height / 3:
-            return 'top'
-        elif y_center < 2 * height / 3:
-            return 'middle'
-        else:
-            return 'bottom'
+        return np.select(
+            [y_center < height / 3, y_center < 2 * height / 3],
+            ['top', 'middle'],
+            default='bottom'
+        ).tolist()
 
-    def calculate_avg_confidence(self, blocks: List[LayoutBlock]) -> float:
+    def calculate_avg_confidence(self, blocks: List[Dict]) -> float:
         """Calculate average confidence across all OCR blocks.
 
         Args:
-            blocks: List of layout blocks
+            blocks: List of layout block dicts
 
         Returns:
             Average confidence score (0-1)
@@ -147,5 +177,5 @@ class OCRExtractor:
         if not blocks:
             return 0.0
 
-        total_confidence = sum(block.conf for block in blocks)
+        total_confidence = sum(block['conf'] for block in blocks)
         return total_confidence / len(blocks)
@@ -1,18 +1,112 @@
 """Abstract base class for LLM adapters."""
 
+import asyncio
+import hashlib
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Union
+
+import httpx
+
+# Called with (field_name, field_value) as each extracted field becomes available
+FieldCallback = Callable[[str, Any], Awaitable[None]]
+
+# Default cap on in-flight requests for the *_many fan-out helpers
+DEFAULT_MAX_CONCURRENCY = 16
+
+# Bump whenever the extraction prompt changes so cached results are invalidated
+PROMPT_VERSION = "v1"
+
+# Invariant part of the extraction prompt, built once at import
+_PROMPT_HEAD = """Extract event information from the provided content and return ONLY a JSON object with this structure:
+
+{
+  "fields": {
+    "event_name": {"value": "Conference Title", "confidence": 0.95, "source": "line 1"},
+    "date": {"value": "2026-03-15", "confidence": 0.90, "source": "line 2"},
+    "time": {"value": "09:00-17:00", "confidence": 0.85, "source": "line 3"},
+    "venue_name": {"value": "Convention Center", "confidence": 0.92, "source": "line 4"},
+    "venue_address": {"value": "123 Main St, City, State", "confidence": 0.88, "source": "line 5"},
+    "description": {"value": "Event description", "confidence": 0.80, "source": "lines 6-8"},
+    "organizer": {"value": "Organizing Entity", "confidence": 0.75, "source": "line 10"},
+    "contact_email": {"value": "info@event.com", "confidence": 0.90, "source": "line 11"},
+    "contact_phone": {"value": "(555) 123-4567", "confidence": 0.85, "source": "line 12"},
+    "ticket_price": {"value": "$50", "confidence": 0.80, "source": "line 13"},
+    "website": {"value": "https://event.com", "confidence": 0.95, "source": "line 14"},
+    "registration_link": {"value": "https://event.com/register", "confidence": 0.90, "source": "line 15"}
+  },
+  "extra": [
+    {"key": "dress_code", "value": "Business casual", "confidence": 0.70, "source": "line 16"},
+    {"key": "parking_info", "value": "Free parking", "confidence": 0.65, "source": "line 17"}
+  ]
+}
+
+**IMPORTANT RULES:**
+"""
+
+# Variable part of the extraction prompt, formatted per call
+_PROMPT_TAIL_FMT = """1. Use timezone: {tz} for date/time interpretation
+2. Only include fields that are actually present (use null for missing fields or omit them)
+3. Confidence: 0.0-1.0 based on text clarity and certainty
+4. Source: reference to where the information was found (e.g., "line 1", "top banner", "bottom left")
+5. Core fields belong in "fields" object: event_name, date, time, venue_name, venue_address, description, organizer, contact_email, contact_phone, ticket_price, website, registration_link
+6. Any additional non-core information goes in "extra" array with key-value pairs
+7. Return ONLY valid JSON - no markdown code blocks, no explanations, no additional text
+8. Use ISO 8601 format for dates (YYYY-MM-DD) when possible
+9. Use 24-hour format for times (HH:MM or HH:MM-HH:MM) when possible
+
+{ctx}
+
+Remember: Return ONLY the JSON object, nothing else."""
+
+
+@lru_cache(maxsize=64)
+def _vision_prompt(timezone: str) -> str:
+    """Build the context-free (vision) prompt once per timezone.
+
+    Args:
+        timezone: Timezone for interpretation
+
+    Returns:
+        Formatted prompt string
+    """
+    return _PROMPT_HEAD + _PROMPT_TAIL_FMT.format(tz=timezone, ctx="")
 
 
 class LLMAdapter(ABC):
     """Abstract base class for LLM providers."""
 
+    provider: str = ""
+    model: str = ""
+    key_hash: str = ""  # Hash prefix of the API key; part of every cache key
+
+    def __init__(self, http_client: Optional[httpx.AsyncClient] = None):
+        """Initialize adapter.
+
+        Args:
+            http_client: Shared HTTP client for outbound calls (optional)
+        """
+        self.http_client = http_client
+
+    @staticmethod
+    def _hash_key(api_key: str) -> str:
+        """Short, non-reversible identifier for an API key.
+
+        Args:
+            api_key: Provider API key
+
+        Returns:
+            First 16 hex digits of the key's SHA-256
+        """
+        return hashlib.sha256(api_key.encode()).hexdigest()[:16]
+
     @abstractmethod
     async def text_to_json(
         self,
         ocr_text: str,
         layout_blocks: List[Dict],
-        timezone: str = "UTC"
+        timezone: str = "UTC",
+        on_field: Optional[FieldCallback] = None
     ) -> Dict[str, Any]:
         """Extract structured JSON from OCR text.
 
@@ -20,6 +114,7 @@ class LLMAdapter(ABC):
             ocr_text: Full OCR extracted text
             layout_blocks: List of text blocks with bounding boxes
             timezone: Timezone for date/time interpretation
+            on_field: Awaited with each field as soon as it is available (optional)
 
         Returns:
             Dictionary with 'fields' and 'extra' keys containing extracted data
@@ -30,19 +125,117 @@ class LLMAdapter(ABC):
     async def image_to_json(
         self,
         image_bytes: bytes,
-        timezone: str = "UTC"
+        timezone: str = "UTC",
+        on_field: Optional[FieldCallback] = None
     ) -> Dict[str, Any]:
         """Extract structured JSON directly from image using vision capabilities.
 
         Args:
             image_bytes: Raw image bytes
             timezone: Timezone for date/time interpretation
+            on_field: Awaited with each field as soon as it is available (optional)
 
         Returns:
             Dictionary with 'fields' and 'extra' keys containing extracted data
         """
         pass
 
+    async def text_to_json_many(
+        self,
+        items: List[Tuple[str, List[Dict]]],
+        timezone: str = "UTC",
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY
+    ) -> List[Union[Dict[str, Any], BaseException]]:
+        """Run text_to_json for several OCR results concurrently.
+
+        Args:
+            items: (ocr_text, layout_blocks) pairs
+            timezone: Timezone for date/time interpretation
+            max_concurrency: Maximum number of calls in flight at once
+
+        Returns:
+            One result per item, in input order. Exceptions raised by a call
+            are returned in its slot instead of being raised.
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def _one(ocr_text: str, layout_blocks: List[Dict]) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.text_to_json(ocr_text, layout_blocks, timezone)
+
+        return await asyncio.gather(
+            *(_one(ocr_text, layout_blocks) for ocr_text, layout_blocks in items),
+            return_exceptions=True
+        )
+
+    async def image_to_json_many(
+        self,
+        images: List[bytes],
+        timezone: str = "UTC",
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY
+    ) -> List[Union[Dict[str, Any], BaseException]]:
+        """Run image_to_json for several images concurrently.
+
+        Args:
+            images: Raw image bytes, one entry per poster
+            timezone: Timezone for date/time interpretation
+            max_concurrency: Maximum number of calls in flight at once
+
+        Returns:
+            One result per image, in input order. Exceptions raised by a call
+            are returned in its slot instead of being raised.
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def _one(image_bytes: bytes) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.image_to_json(image_bytes, timezone)
+
+        return await asyncio.gather(
+            *(_one(image_bytes) for image_bytes in images),
+            return_exceptions=True
+        )
+
+    async def image_to_json_batch(
+        self,
+        images: List[bytes],
+        timezone: str = "UTC"
+    ) -> List[Dict[str, Any]]:
+        """Extract structured JSON from several images.
+
+        The default issues one image_to_json call per image concurrently.
+        Providers that accept multiple images per request can override this
+        to use a single call.
+
+        Args:
+            images: Raw image bytes, one entry per poster
+            timezone: Timezone for date/time interpretation
+
+        Returns:
+            One extraction result per image, in input order
+        """
+        results = await self.image_to_json_many(images, timezone)
+
+        # A failed call only fails its own image
+        return [
+            {"fields": {}, "extra": [], "error": str(result)}
+            if isinstance(result, BaseException) else result
+            for result in results
+        ]
+
+    @staticmethod
+    async def _emit_fields(result: Dict[str, Any], on_field: Optional[FieldCallback]) -> None:
+        """Report every field of a complete result to a field callback.
+
+        Args:
+            result: Extraction result
+            on_field: Field callback (no-op when None)
+        """
+        if on_field is None:
+            return
+        for name, value in (result.get("fields") or {}).items():
+            await on_field(name, value)
+
     def _build_extraction_prompt(self, context: str = "", timezone: str = "UTC") -> str:
         """Build prompt for event data extraction.
 
@@ -53,40 +246,6 @@ class LLMAdapter(ABC):
         Returns:
             Formatted prompt string
         """
-        return f"""Extract event information from the provided content and return ONLY a JSON object with this structure:
-
-{{
-  "fields": {{
-    "event_name": {{"value": "Conference Title", "confidence": 0.95, "source": "line 1"}},
-    "date": {{"value": "2026-03-15", "confidence": 0.90, "source": "line 2"}},
-    "time": {{"value": "09:00-17:00", "confidence": 0.85, "source": "line 3"}},
-    "venue_name": {{"value": "Convention Center", "confidence": 0.92, "source": "line 4"}},
-    "venue_address": {{"value": "123 Main St, City, State", "confidence": 0.88, "source": "line 5"}},
-    "description": {{"value": "Event description", "confidence": 0.80, "source": "lines 6-8"}},
-    "organizer": {{"value": "Organizing Entity", "confidence": 0.75, "source": "line 10"}},
-    "contact_email": {{"value": "info@event.com", "confidence": 0.90, "source": "line 11"}},
-    "contact_phone": {{"value": "(555) 123-4567", "confidence": 0.85, "source": "line 12"}},
-    "ticket_price": {{"value": "$50", "confidence": 0.80, "source": "line 13"}},
-    "website": {{"value": "https://event.com", "confidence": 0.95, "source": "line 14"}},
-    "registration_link": {{"value": "https://event.com/register", "confidence": 0.90, "source": "line 15"}}
-  }},
-  "extra": [
-    {{"key": "dress_code", "value": "Business casual", "confidence": 0.70, "source": "line 16"}},
-    {{"key": "parking_info", "value": "Free parking", "confidence": 0.65, "source": "line 17"}}
-  ]
-}}
-
-**IMPORTANT RULES:**
-1. Use timezone: {timezone} for date/time interpretation
-2. Only include fields that are actually present (use null for missing fields or omit them)
-3. Confidence: 0.0-1.0 based on text clarity and certainty
-4. Source: reference to where the information was found (e.g., "line 1", "top banner", "bottom left")
-5. Core fields belong in "fields" object: event_name, date, time, venue_name, venue_address, description, organizer, contact_email, contact_phone, ticket_price, website, registration_link
-6. Any additional non-core information goes in "extra" array with key-value pairs
-7. Return ONLY valid JSON - no markdown code blocks, no explanations, no additional text
-8. Use ISO 8601 format for dates (YYYY-MM-DD) when possible
-9. Use 24-hour format for times (HH:MM or HH:MM-HH:MM) when possible
-
-{context}
-
-Remember: Return ONLY the JSON object, nothing else."""
+        if not context:
+            return _vision_prompt(timezone)
+        return _PROMPT_HEAD + _PROMPT_TAIL_FMT.format(tz=timezone, ctx=context)
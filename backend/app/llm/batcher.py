@@ -0,0 +1,157 @@
+"""Micro-batching of concurrent vision extraction requests."""
+
+import asyncio
+import logging
+from typing import Any, Dict, List, Set, Tuple
+
+from app.llm.base import LLMAdapter
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncBatcher:
+    """Coalesces concurrent vision requests into multi-image LLM calls.
+
+    Requests are grouped by adapter (and so by API key and model) and by
+    timezone. A group is flushed once it holds max_batch images, or
+    flush_interval seconds after its first image arrived.
+    """
+
+    def __init__(self, flush_interval: float = 0.05, max_batch: int = 8):
+        """Initialize batcher.
+
+        Args:
+            flush_interval: Seconds to wait for more requests before flushing
+            max_batch: Maximum images per LLM call
+        """
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+
+        self._pending: Dict[Tuple[int, str], List[Tuple[bytes, asyncio.Future]]] = {}
+        self._adapters: Dict[Tuple[int, str], LLMAdapter] = {}
+        self._timers: Dict[Tuple[int, str], asyncio.TimerHandle] = {}
+        self._inflight: Set[asyncio.Task] = set()
+
+    async def submit(
+        self,
+        adapter: LLMAdapter,
+        image_bytes: bytes,
+        timezone: str = "UTC"
+    ) -> Dict[str, Any]:
+        """Queue an image for extraction and wait for its result.
+
+        Args:
+            adapter: LLM adapter to run the extraction with
+            image_bytes: Raw image bytes
+            timezone: Timezone for date/time interpretation
+
+        Returns:
+            Extraction result for this image
+        """
+        loop = asyncio.get_running_loop()
+        key = (id(adapter), timezone)
+        future = loop.create_future()
+
+        batch = self._pending.setdefault(key, [])
+        batch.append((image_bytes, future))
+        self._adapters[key] = adapter
+
+        if len(batch) >= self.max_batch:
+            self._flush(key)
+        elif len(batch) == 1:
+            self._timers[key] = loop.call_later(self.flush_interval, self._flush, key)
+
+        try:
+            return await future
+        except asyncio.CancelledError:
+            self._discard(key, future)
+            raise
+
+    async def close(self) -> None:
+        """Flush every pending group and wait for in-flight batches.
+
+        Called on shutdown so queued requests get their results instead of
+        hanging on a loop that is going away.
+        """
+        for key in list(self._pending):
+            self._flush(key)
+
+        if self._inflight:
+            await asyncio.gather(*self._inflight, return_exceptions=True)
+
+    def _discard(self, key: Tuple[int, str], future: asyncio.Future) -> None:
+        """Drop a cancelled request that has not been sent yet.
+
+        Args:
+            key: Group key (adapter id, timezone)
+            future: Future of the cancelled request
+        """
+        batch = self._pending.get(key)
+        if batch is None:
+            return
+
+        batch[:] = [entry for entry in batch if entry[1] is not future]
+        if not batch:
+            # Nobody is waiting on this group any more
+            del self._pending[key]
+            self._adapters.pop(key, None)
+            timer = self._timers.pop(key, None)
+            if timer is not None:
+                timer.cancel()
+
+    def _flush(self, key: Tuple[int, str]) -> None:
+        """Send the pending batch for a group.
+
+        Args:
+            key: Group key (adapter id, timezone)
+        """
+        timer = self._timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+
+        batch = self._pending.pop(key, None)
+        adapter = self._adapters.pop(key, None)
+        if not batch:
+            return
+
+        task = asyncio.create_task(self._run(adapter, key[1], batch))
+        self._inflight.add(task)
+        task.add_done_callback(self._inflight.discard)
+
+    async def _run(
+        self,
+        adapter: LLMAdapter,
+        timezone: str,
+        batch: List[Tuple[bytes, asyncio.Future]]
+    ) -> None:
+        """Run one batch and resolve its futures.
+
+        Args:
+            adapter: LLM adapter for the group
+            timezone: Timezone for the group
+            batch: Queued (image bytes, future) pairs
+        """
+        images = [image_bytes for image_bytes, _ in batch]
+
+        try:
+            if len(images) == 1:
+                results = [await adapter.image_to_json(images[0], timezone=timezone)]
+            else:
+                logger.info(f"Flushing vision batch of {len(images)} images")
+                results = await adapter.image_to_json_batch(images, timezone=timezone)
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+        # Never leave a waiter hanging on a short result list
+        for _, future in batch[len(results):]:
+            if not future.done():
+                future.set_exception(
+                    RuntimeError(f"Vision batch returned {len(results)} results for {len(batch)} images")
+                )
@@ -0,0 +1,113 @@
+"""Exact-match cache for LLM adapter responses.
+
+This sits below the pipeline's result cache (app.core.llm_cache), which is
+keyed on the uploaded bytes and skips preprocessing and OCR as well. Keys
+here are the LLM input itself (OCR text or image), so uploads that differ
+as files but OCR to the same text still share one response, and entries
+can be shared across workers through Redis.
+"""
+
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+try:
+    import redis.asyncio as redis
+except ImportError:  # redis is optional; the in-memory backend is used instead
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL = 24 * 60 * 60  # 1 day in seconds
+
+
+class LLMCache:
+    """Async key-value cache for adapter responses.
+
+    Values are stored as JSON strings so every hit returns a fresh copy that
+    callers are free to mutate. Entries live in Redis when a URL is given
+    (shared across workers), otherwise in a bounded in-process LRU.
+    """
+
+    def __init__(
+        self,
+        ttl: int = DEFAULT_TTL,
+        max_entries: int = 1024,
+        redis_url: Optional[str] = None
+    ):
+        """Initialize the cache.
+
+        Args:
+            ttl: Default time to live in seconds
+            max_entries: Capacity of the in-memory backend
+            redis_url: Redis connection URL (optional)
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._redis = None
+
+        if redis_url:
+            if redis is None:
+                logger.warning("REDIS_URL is set but redis is not installed, using in-memory LLM cache")
+            else:
+                self._redis = redis.from_url(redis_url)
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Look up a cached response.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Cached response, or None on miss or expiry
+        """
+        if self._redis is not None:
+            try:
+                value = await self._redis.get(f"llm:{key}")
+            except Exception as e:
+                logger.warning(f"LLM cache read failed: {e}")
+                return None
+            return json.loads(value) if value is not None else None
+
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return json.loads(value)
+
+    async def set(self, key: str, value: Dict[str, Any], ttl: Optional[int] = None) -> None:
+        """Store a response.
+
+        Args:
+            key: Cache key
+            value: JSON-serializable response
+            ttl: Time to live in seconds (defaults to the cache TTL)
+        """
+        ttl = ttl or self.ttl
+        payload = json.dumps(value)
+
+        if self._redis is not None:
+            try:
+                await self._redis.set(f"llm:{key}", payload, ex=ttl)
+            except Exception as e:
+                logger.warning(f"LLM cache write failed: {e}")
+            return
+
+        self._entries[key] = (time.monotonic() + ttl, payload)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def close(self) -> None:
+        """Release the Redis connection pool, if any."""
+        if self._redis is not None:
+            await self._redis.aclose()
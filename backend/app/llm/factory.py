@@ -1,23 +1,43 @@
 """Factory for creating LLM adapters."""
 
-from typing import Optional
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+import httpx
 
 from app.llm.base import LLMAdapter
+from app.llm.cache import LLMCache
 from app.llm.mock_adapter import MockLLMAdapter
 from app.llm.gemini_adapter import GeminiAdapter
 
+# Maximum number of adapters kept alive (API keys are supplied per user)
+MAX_CACHED_ADAPTERS = 32
+
+_adapter_cache: "OrderedDict[Tuple, LLMAdapter]" = OrderedDict()
+_adapter_cache_lock = threading.Lock()
+
 
 def create_llm_adapter(
     provider: str,
     api_key: Optional[str] = None,
-    model: Optional[str] = None
+    model: Optional[str] = None,
+    http_client: Optional[httpx.AsyncClient] = None,
+    cache: Optional[LLMCache] = None
 ) -> LLMAdapter:
     """Create and return appropriate LLM adapter based on provider.
 
+    Adapters are cached per (provider, API key hash, model, HTTP client,
+    response cache) so their SDK clients and HTTP connections are reused
+    across requests.
+
     Args:
         provider: Provider name ("mock", "gemini")
         api_key: API key for the provider (not needed for mock)
         model: Optional model name override
+        http_client: Shared async HTTP client to inject into the adapter
+        cache: Shared response cache to inject into the adapter
 
     Returns:
         Initialized LLM adapter instance
@@ -27,15 +47,77 @@ def create_llm_adapter(
     """
     provider = provider.lower()
 
+    if provider == "gemini":
+        model = model or "gemini-2.5-flash"
+
+    key = (
+        provider,
+        hashlib.sha256(api_key.encode()).hexdigest() if api_key else None,
+        model,
+        # The objects themselves, not id(): ids of collected clients are
+        # reused, which would hand out adapters bound to a closed client
+        http_client,
+        cache
+    )
+
+    with _adapter_cache_lock:
+        adapter = _adapter_cache.get(key)
+        if adapter is not None:
+            _adapter_cache.move_to_end(key)
+            return adapter
+
+        adapter = _build_adapter(provider, api_key, model, http_client, cache)
+
+        _adapter_cache[key] = adapter
+        if len(_adapter_cache) > MAX_CACHED_ADAPTERS:
+            _adapter_cache.popitem(last=False)
+
+        return adapter
+
+
+def clear_adapter_cache() -> None:
+    """Drop every cached adapter.
+
+    Called on shutdown, when the shared HTTP client and response cache the
+    adapters are bound to are closed.
+    """
+    with _adapter_cache_lock:
+        _adapter_cache.clear()
+
+
+def _build_adapter(
+    provider: str,
+    api_key: Optional[str],
+    model: Optional[str],
+    http_client: Optional[httpx.AsyncClient],
+    cache: Optional[LLMCache]
+) -> LLMAdapter:
+    """Instantiate a new adapter for a provider.
+
+    Args:
+        provider: Lowercase provider name
+        api_key: API key for the provider
+        model: Model name
+        http_client: Shared async HTTP client
+        cache: Shared response cache
+
+    Returns:
+        New LLM adapter instance
+
+    Raises:
+        ValueError: If provider is unknown or if API key is missing for real providers
+    """
     if provider == "mock":
-        return MockLLMAdapter()
+        return MockLLMAdapter(http_client=http_client)
 
     elif provider == "gemini":
         if not api_key:
             raise ValueError("Gemini API key is required")
         return GeminiAdapter(
             api_key=api_key,
-            model=model or "gemini-2.5-flash"
+            model=model,
+            http_client=http_client,
+            cache=cache
         )
 
     else:
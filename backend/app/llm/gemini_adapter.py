@@ -1,14 +1,17 @@
 """Google Gemini adapter with vision capabilities."""
 
-import base64
-import json
+import hashlib
 import logging
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 
+import httpx
+import orjson
 import google.genai as genai
-from google.genai.types import GenerateContentConfig, Part
+from google.genai.types import GenerateContentConfig, HttpOptions, Part
 
-from app.llm.base import LLMAdapter
+from app.llm.base import FieldCallback, LLMAdapter, PROMPT_VERSION
+from app.llm.cache import LLMCache
+from app.llm.streaming import FieldStreamParser
 
 logger = logging.getLogger(__name__)
 
@@ -16,24 +19,98 @@ logger = logging.getLogger(__name__)
 class GeminiAdapter(LLMAdapter):
     """Adapter for Google Gemini with vision capabilities."""
 
-    def __init__(self, api_key: str, model: str = "gemini-2.5-flash"):
+    provider = "gemini"
+
+    def __init__(
+        self,
+        api_key: str,
+        model: str = "gemini-2.5-flash",
+        http_client: Optional[httpx.AsyncClient] = None,
+        cache: Optional[LLMCache] = None
+    ):
         """Initialize Gemini adapter.
 
         Args:
             api_key: Google Gemini API key
             model: Model name (default: gemini-2.5-flash - latest stable model with vision)
+            http_client: Shared async HTTP client (optional, reuses pooled connections)
+            cache: Response cache consulted before calling the API (optional)
         """
         if not api_key:
             raise ValueError("Gemini API key is required")
 
-        self.client = genai.Client(api_key=api_key)
+        super().__init__(http_client)
+
+        if http_client is not None:
+            self.client = genai.Client(
+                api_key=api_key,
+                http_options=HttpOptions(httpx_async_client=http_client)
+            )
+        else:
+            self.client = genai.Client(api_key=api_key)
         self.model = model
+        self.cache = cache
+        # Responses are only shared between requests made with the same key
+        self.key_hash = self._hash_key(api_key)
+
+    def _text_cache_key(self, ocr_text: str, timezone: str) -> str:
+        """Build the response cache key for an OCR text request."""
+        prefix = f"{self.key_hash}|{self.model}|{timezone}|{PROMPT_VERSION}|".encode()
+        return "text:" + hashlib.sha256(prefix + ocr_text.encode()).hexdigest()
+
+    def _image_cache_key(self, image_bytes: bytes, timezone: str) -> str:
+        """Build the response cache key for a vision request."""
+        hasher = hashlib.blake2b(f"{self.key_hash}|{self.model}|{timezone}|{PROMPT_VERSION}|".encode())
+        hasher.update(image_bytes)
+        return "image:" + hasher.hexdigest()
+
+    async def _generate_text(
+        self,
+        contents: Any,
+        config: GenerateContentConfig,
+        on_field: Optional[FieldCallback] = None
+    ) -> str:
+        """Run a generation and return the full response text.
+
+        With a field callback the response is streamed and each field is
+        reported as soon as its JSON is complete.
+
+        Args:
+            contents: Request contents
+            config: Generation config
+            on_field: Field callback (optional)
+
+        Returns:
+            Response text
+        """
+        if on_field is None:
+            response = await self.client.aio.models.generate_content(
+                model=self.model,
+                contents=contents,
+                config=config
+            )
+            return response.text
+
+        parser = FieldStreamParser()
+        parts = []
+        async for chunk in await self.client.aio.models.generate_content_stream(
+            model=self.model,
+            contents=contents,
+            config=config
+        ):
+            text = chunk.text or ""
+            parts.append(text)
+            for name, value in parser.feed(text):
+                await on_field(name, value)
+
+        return "".join(parts)
 
     async def text_to_json(
         self,
         ocr_text: str,
         layout_blocks: List[Dict],
-        timezone: str = "UTC"
+        timezone: str = "UTC",
+        on_field: Optional[FieldCallback] = None
     ) -> Dict[str, Any]:
         """Extract structured data from OCR text using Gemini.
 
@@ -41,10 +118,19 @@ class GeminiAdapter(LLMAdapter):
             ocr_text: Full OCR extracted text
             layout_blocks: Text blocks with positions
             timezone: Timezone for interpretation
+            on_field: Awaited with each field as it streams in (optional)
 
         Returns:
             Extracted fields and extra data
         """
+        if self.cache is not None:
+            cache_key = self._text_cache_key(ocr_text, timezone)
+            cached = await self.cache.get(cache_key)
+            if cached is not None:
+                logger.info("Gemini text_to_json served from cache")
+                await self._emit_fields(cached, on_field)
+                return cached
+
         prompt = self._build_extraction_prompt(
             context=f"\nOCR Text:\n{ocr_text}",
             timezone=timezone
@@ -57,31 +143,16 @@ class GeminiAdapter(LLMAdapter):
                 response_mime_type="application/json"
             )
 
-            print(f"\n{'='*60}")
-            print(f"[GEMINI TEXT_TO_JSON] Calling API with model: {self.model}")
-            print(f"[GEMINI TEXT_TO_JSON] OCR Text length: {len(ocr_text)} chars")
-            print(f"{'='*60}\n")
+            logger.debug("Calling Gemini text_to_json (model=%s, %d chars)", self.model, len(ocr_text))
+            result_text = await self._generate_text(prompt, config, on_field)
 
-            response = self.client.models.generate_content(
-                model=self.model,
-                contents=prompt,
-                config=config
-            )
-
-            result_text = response.text
-            print(f"\n{'='*60}")
-            print(f"[GEMINI TEXT_TO_JSON] Response received successfully")
-            print(f"[GEMINI TEXT_TO_JSON] Response preview: {result_text[:300]}...")
-            print(f"{'='*60}\n")
-
-            result = json.loads(result_text)
+            result = orjson.loads(result_text)
+            if self.cache is not None:
+                await self.cache.set(cache_key, result)
             return result
 
         except Exception as e:
             # Log and return error in structured format
-            print(f"\n{'='*60}")
-            print(f"[GEMINI TEXT_TO_JSON ERROR] {type(e).__name__}: {str(e)}")
-            print(f"{'='*60}\n")
             logger.error(f"Gemini API error in text_to_json: {str(e)}", exc_info=True)
             return {
                 "fields": {},
@@ -92,17 +163,30 @@ class GeminiAdapter(LLMAdapter):
     async def image_to_json(
         self,
         image_bytes: bytes,
-        timezone: str = "UTC"
+        timezone: str = "UTC",
+        on_field: Optional[FieldCallback] = None
     ) -> Dict[str, Any]:
         """Extract structured data directly from image using Gemini Vision.
 
+        The image is sent as raw bytes via Part.from_bytes; the SDK handles
+        transport encoding, so callers must not base64-encode it first.
+
         Args:
-            image_bytes: Raw image bytes
+            image_bytes: Raw (not base64-encoded) image bytes
             timezone: Timezone for interpretation
+            on_field: Awaited with each field as it streams in (optional)
 
         Returns:
             Extracted fields and extra data
         """
+        if self.cache is not None:
+            cache_key = self._image_cache_key(image_bytes, timezone)
+            cached = await self.cache.get(cache_key)
+            if cached is not None:
+                logger.info("Gemini image_to_json served from cache")
+                await self._emit_fields(cached, on_field)
+                return cached
+
         prompt = self._build_extraction_prompt(timezone=timezone)
 
         try:
@@ -112,41 +196,90 @@ class GeminiAdapter(LLMAdapter):
                 response_mime_type="application/json"
             )
 
-            print(f"\n{'='*60}")
-            print(f"[GEMINI VISION] Calling Vision API with model: {self.model}")
-            print(f"[GEMINI VISION] Image size: {len(image_bytes)} bytes")
-            print(f"{'='*60}\n")
-
+            logger.debug("Calling Gemini image_to_json (model=%s, %d bytes)", self.model, len(image_bytes))
             # Create multimodal content with image and text
-            response = self.client.models.generate_content(
-                model=self.model,
-                contents=[
+            result_text = await self._generate_text(
+                [
                     Part.from_bytes(
                         data=image_bytes,
                         mime_type="image/jpeg"
                     ),
                     prompt
                 ],
-                config=config
+                config,
+                on_field
             )
 
-            result_text = response.text
-            print(f"\n{'='*60}")
-            print(f"[GEMINI VISION] Response received successfully")
-            print(f"[GEMINI VISION] Response preview: {result_text[:300]}...")
-            print(f"{'='*60}\n")
-
-            result = json.loads(result_text)
+            result = orjson.loads(result_text)
+            if self.cache is not None:
+                await self.cache.set(cache_key, result)
             return result
 
         except Exception as e:
             # Log and return error in structured format
-            print(f"\n{'='*60}")
-            print(f"[GEMINI VISION ERROR] {type(e).__name__}: {str(e)}")
-            print(f"{'='*60}\n")
             logger.error(f"Gemini API error in image_to_json: {str(e)}", exc_info=True)
             return {
                 "fields": {},
                 "extra": [],
                 "error": str(e)
             }
+
+    async def image_to_json_batch(
+        self,
+        images: List[bytes],
+        timezone: str = "UTC"
+    ) -> List[Dict[str, Any]]:
+        """Extract structured data from several images in one Gemini call.
+
+        Falls back to one call per image if the response does not contain
+        exactly one result per image.
+
+        Args:
+            images: Raw image bytes, one entry per poster
+            timezone: Timezone for interpretation
+
+        Returns:
+            One extraction result per image, in input order
+        """
+        prompt = self._build_extraction_prompt(
+            context=(
+                f"\nThe {len(images)} images above are separate event posters. "
+                f"Return a JSON array of exactly {len(images)} objects with the "
+                f"structure shown, one per image, in the order given."
+            ),
+            timezone=timezone
+        )
+
+        contents = []
+        for index, image_bytes in enumerate(images, start=1):
+            contents.append(f"Image {index}:")
+            contents.append(Part.from_bytes(data=image_bytes, mime_type="image/jpeg"))
+        contents.append(prompt)
+
+        try:
+            config = GenerateContentConfig(
+                temperature=0.1,
+                response_mime_type="application/json"
+            )
+
+            logger.info(f"Calling Gemini vision for a batch of {len(images)} images")
+
+            response = await self.client.aio.models.generate_content(
+                model=self.model,
+                contents=contents,
+                config=config
+            )
+            results = orjson.loads(response.text)
+        except Exception as e:
+            logger.error(f"Gemini API error in image_to_json_batch: {str(e)}", exc_info=True)
+            results = None
+
+        if (
+            not isinstance(results, list)
+            or len(results) != len(images)
+            or not all(isinstance(result, dict) for result in results)
+        ):
+            logger.warning("Batched vision response did not match the batch, retrying per image")
+            return await super().image_to_json_batch(images, timezone)
+
+        return results
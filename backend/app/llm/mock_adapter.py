@@ -1,19 +1,23 @@
 """Mock LLM adapter for testing without API calls."""
 
 import asyncio
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 
-from app.llm.base import LLMAdapter
+from app.llm.base import FieldCallback, LLMAdapter
 
 
 class MockLLMAdapter(LLMAdapter):
     """Mock adapter that returns deterministic sample data for testing."""
 
+    provider = "mock"
+    model = "mock"
+
     async def text_to_json(
         self,
         ocr_text: str,
         layout_blocks: List[Dict],
-        timezone: str = "UTC"
+        timezone: str = "UTC",
+        on_field: Optional[FieldCallback] = None
     ) -> Dict[str, Any]:
         """Return mock extraction from OCR text.
 
@@ -21,6 +25,7 @@ class MockLLMAdapter(LLMAdapter):
             ocr_text: OCR extracted text (ignored in mock)
             layout_blocks: Text blocks (ignored in mock)
             timezone: Timezone (ignored in mock)
+            on_field: Field callback, called once per mock field
 
         Returns:
             Mock extraction result
@@ -28,7 +33,7 @@ class MockLLMAdapter(LLMAdapter):
         # Simulate API latency
         await asyncio.sleep(0.5)
 
-        return {
+        result = {
             "fields": {
                 "event_name": {
                     "value": "Mock Tech Conference 2026",
@@ -102,16 +107,21 @@ class MockLLMAdapter(LLMAdapter):
             ]
         }
 
+        await self._emit_fields(result, on_field)
+        return result
+
     async def image_to_json(
         self,
         image_bytes: bytes,
-        timezone: str = "UTC"
+        timezone: str = "UTC",
+        on_field: Optional[FieldCallback] = None
     ) -> Dict[str, Any]:
         """Return mock extraction from image.
 
         Args:
             image_bytes: Image data (ignored in mock)
             timezone: Timezone (ignored in mock)
+            on_field: Field callback, called once per mock field
 
         Returns:
             Mock extraction result (same as text_to_json)
@@ -120,4 +130,4 @@ class MockLLMAdapter(LLMAdapter):
         await asyncio.sleep(1.0)
 
         # Return same mock data as text_to_json
-        return await self.text_to_json("", [], timezone)
+        return await self.text_to_json("", [], timezone, on_field)
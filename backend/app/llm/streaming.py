@@ -0,0 +1,74 @@
+"""Incremental parsing of streamed LLM JSON responses."""
+
+import json
+import re
+from typing import Any, List, Tuple
+
+_FIELDS_START = re.compile(r'"fields"\s*:\s*\{')
+_SEPARATOR = re.compile(r'[\s,]*')
+_WHITESPACE = re.compile(r'\s*')
+_NUMBER_END = re.compile(r'[\s,}]')
+
+
+class FieldStreamParser:
+    """Yields entries of the top-level "fields" object as they complete.
+
+    Feed it response text chunk by chunk; each call returns the
+    (field_name, field_value) pairs whose JSON became complete with that
+    chunk. The full response must still be parsed once streaming ends.
+    """
+
+    def __init__(self):
+        """Initialize an empty parser."""
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = -1  # Position inside the fields object, -1 until it is found
+        self._done = False
+
+    def feed(self, chunk: str) -> List[Tuple[str, Any]]:
+        """Add a chunk of response text.
+
+        Args:
+            chunk: Next piece of the streamed response
+
+        Returns:
+            Fields completed by this chunk, in response order
+        """
+        self._buffer += chunk
+        completed = []
+
+        if self._done:
+            return completed
+
+        if self._pos < 0:
+            match = _FIELDS_START.search(self._buffer)
+            if match is None:
+                return completed
+            self._pos = match.end()
+
+        while True:
+            pos = _SEPARATOR.match(self._buffer, self._pos).end()
+            if pos >= len(self._buffer):
+                break
+
+            if self._buffer[pos] == '}':
+                self._done = True
+                break
+
+            try:
+                name, pos = self._decoder.raw_decode(self._buffer, pos)
+                pos = self._buffer.index(':', pos) + 1
+                pos = _WHITESPACE.match(self._buffer, pos).end()
+                value, end = self._decoder.raw_decode(self._buffer, pos)
+            except ValueError:
+                # Entry is not complete yet
+                break
+
+            # A number is only complete once a delimiter follows it
+            if isinstance(value, (int, float)) and not _NUMBER_END.match(self._buffer, end):
+                break
+
+            completed.append((name, value))
+            self._pos = end
+
+        return completed
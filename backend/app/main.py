@@ -1,23 +1,115 @@
 """FastAPI main application."""
 
+import atexit
 import logging
+import logging.handlers
+import queue
+from contextlib import asynccontextmanager
+from typing import Optional
+
+import httpx
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.api.v1.endpoints import extract
 from app.config import get_settings
-
-# Configure logging
+from app.llm.base import LLMAdapter
+from app.llm.batcher import AsyncBatcher
+from app.llm.cache import LLMCache
+from app.llm.factory import clear_adapter_cache, create_llm_adapter
+from app.preprocessing.complexity_scorer import shutdown_scoring_pool
+from app.preprocessing.image_processor import shutdown_preprocess_pool
+
+# Configure logging: records are queued and written by a background thread,
+# so handler I/O never blocks the event loop
+_log_handler = logging.StreamHandler()
+_log_handler.setFormatter(
+    logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+)
+_log_queue = queue.SimpleQueue()
+_log_listener = logging.handlers.QueueListener(_log_queue, _log_handler)
 logging.basicConfig(
     level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    handlers=[logging.handlers.QueueHandler(_log_queue)]
 )
+_log_listener.start()
+atexit.register(_log_listener.stop)
 
 logger = logging.getLogger(__name__)
 
 # Get settings
 settings = get_settings()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Create shared resources on startup and release them on shutdown."""
+    logger.info(f"Starting {settings.PROJECT_NAME}")
+    logger.info(f"LLM Provider: {settings.LLM_PROVIDER}")
+    logger.info(f"CORS Origins: {settings.CORS_ORIGINS}")
+    logger.info(f"API Documentation: {settings.API_V1_PREFIX}/docs")
+
+    # One pooled HTTP/2 client for all outbound LLM calls
+    async with httpx.AsyncClient(
+        http2=True,
+        limits=httpx.Limits(
+            max_connections=settings.HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY
+        )
+    ) as client:
+        app.state.http = client
+        app.state.batcher = AsyncBatcher(
+            flush_interval=settings.VISION_BATCH_INTERVAL,
+            max_batch=settings.VISION_BATCH_MAX
+        ) if settings.VISION_BATCH_ENABLED else None
+        app.state.llm_cache = LLMCache(
+            ttl=settings.LLM_RESPONSE_CACHE_TTL,
+            max_entries=settings.LLM_RESPONSE_CACHE_MAX_ENTRIES,
+            redis_url=settings.REDIS_URL or None
+        ) if settings.LLM_RESPONSE_CACHE_ENABLED else None
+        app.state.llm_adapter = _create_default_adapter(client, app.state.llm_cache)
+        try:
+            yield
+        finally:
+            if app.state.batcher is not None:
+                await app.state.batcher.close()
+            if app.state.llm_cache is not None:
+                await app.state.llm_cache.close()
+            clear_adapter_cache()
+            shutdown_preprocess_pool()
+            shutdown_scoring_pool()
+
+    logger.info(f"Shutting down {settings.PROJECT_NAME}")
+
+
+def _create_default_adapter(client: httpx.AsyncClient, cache: Optional[LLMCache]) -> Optional[LLMAdapter]:
+    """Build the adapter for requests that do not bring their own API key.
+
+    Args:
+        client: Shared HTTP client
+        cache: Shared response cache
+
+    Returns:
+        Adapter for the configured provider, or None if it cannot be built
+    """
+    if not settings.LLM_API_KEY and settings.LLM_PROVIDER != "mock":
+        return None
+
+    try:
+        return create_llm_adapter(
+            provider=settings.LLM_PROVIDER,
+            api_key=settings.LLM_API_KEY or None,
+            model=None,
+            http_client=client,
+            cache=cache
+        )
+    except Exception as e:
+        logger.warning(f"Default LLM adapter unavailable: {e}")
+        return None
+
+
 # Create FastAPI app
 app = FastAPI(
     title=settings.PROJECT_NAME,
@@ -25,13 +117,15 @@ app = FastAPI(
     description="Hybrid OCR/Vision system for extracting structured event data from poster images",
     openapi_url=f"{settings.API_V1_PREFIX}/openapi.json",
     docs_url=f"{settings.API_V1_PREFIX}/docs",
-    redoc_url=f"{settings.API_V1_PREFIX}/redoc"
+    redoc_url=f"{settings.API_V1_PREFIX}/redoc",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=settings.CORS_ORIGINS,
+    allow_origins=list(settings.CORS_ORIGINS),
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
@@ -55,6 +149,7 @@ async def root():
         "docs": f"{settings.API_V1_PREFIX}/docs",
         "endpoints": {
             "extract": f"{settings.API_V1_PREFIX}/extract",
+            "extract_stream": f"{settings.API_V1_PREFIX}/extract/stream",
             "health": "/health"
         }
     }
@@ -70,29 +165,24 @@ async def health_check():
     }
 
 
-# Startup event
-@app.on_event("startup")
-async def startup_event():
-    """Log startup information."""
-    logger.info(f"Starting {settings.PROJECT_NAME}")
-    logger.info(f"LLM Provider: {settings.LLM_PROVIDER}")
-    logger.info(f"CORS Origins: {settings.CORS_ORIGINS}")
-    logger.info(f"API Documentation: {settings.API_V1_PREFIX}/docs")
-
-
-# Shutdown event
-@app.on_event("shutdown")
-async def shutdown_event():
-    """Log shutdown information."""
-    logger.info(f"Shutting down {settings.PROJECT_NAME}")
-
-
 if __name__ == "__main__":
+    import os
     import uvicorn
+
+    # Reload runs a single worker; otherwise default to one per core
+    if settings.SERVER_RELOAD:
+        workers = 1
+    else:
+        workers = settings.SERVER_WORKERS or max(2, os.cpu_count() or 1)
+
     uvicorn.run(
         "app.main:app",
         host="0.0.0.0",
         port=8000,
-        reload=True,
+        reload=settings.SERVER_RELOAD,
+        workers=workers,
+        loop="auto",  # uvloop when installed (uvicorn[standard], not on Windows)
+        http="auto",  # httptools when installed
+        timeout_keep_alive=settings.SERVER_KEEPALIVE_TIMEOUT,
         log_level="info"
     )
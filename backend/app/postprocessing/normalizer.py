@@ -1,10 +1,78 @@
 """Field normalization for dates, times, phones, emails, etc."""
 
 import re
-from typing import Optional, Dict, Any
+from typing import Any, Callable, Dict, Optional
 import dateparser
 from datetime import datetime
 
+# Precompiled patterns used on every extraction
+_TIME_HHMM = re.compile(r'(\d{1,2}):(\d{2})\s*([ap]m)?', re.IGNORECASE)
+_TIME_HH = re.compile(r'(\d{1,2})\s*([ap]m)', re.IGNORECASE)
+_TIME_RANGE_SEP = re.compile(r'\s*-\s*|\s+to\s+', re.IGNORECASE)
+_NON_DIGIT = re.compile(r'\D')
+
+# Fields normalized by each FieldNormalizer method
+_DATE_FIELDS = ('date', 'start_date', 'end_date')
+_TIME_FIELDS = ('time', 'start_time', 'end_time')
+_URL_FIELDS = ('website', 'registration_link')
+
+# Common poster date formats, tried before falling back to dateparser.
+# Month-first comes before day-first to match dateparser's default order.
+_FAST_FORMATS = (
+    "%Y-%m-%d",
+    "%m/%d/%Y",
+    "%d/%m/%Y",
+    "%B %d, %Y",
+    "%b %d, %Y",
+    "%d %B %Y",
+    "%d %b %Y",
+    "%Y/%m/%d",
+)
+
+
+def _apply_meridiem(hour: int, meridiem: Optional[str]) -> int:
+    """Convert a 12-hour clock hour to 24-hour.
+
+    12am maps to 0 and 12pm stays 12. Hours without a meridiem, or already
+    past 12, are returned unchanged.
+
+    Args:
+        hour: Parsed hour
+        meridiem: "am"/"pm" in any case, or None
+
+    Returns:
+        Hour on the 24-hour clock
+    """
+    if meridiem and hour <= 12:
+        hour = hour % 12 + (12 if meridiem.lower() == 'pm' else 0)
+    return hour
+
+
+def _normalize_field(
+    fields: Dict[str, Any],
+    name: str,
+    normalize_fn: Callable[[str], str]
+) -> None:
+    """Normalize one field's value in place, marking it if it changed.
+
+    Args:
+        fields: Dictionary of extracted fields
+        name: Field name
+        normalize_fn: Function mapping a raw value to its normalized form
+    """
+    field_data = fields.get(name)
+    if not field_data:
+        return
+
+    value = field_data.get('value')
+    if not value:
+        return
+
+    normalized = normalize_fn(value)
+    if normalized != value:
+        field_data['value'] = normalized
+        field_data['normalized'] = True
+
 
 class FieldNormalizer:
     """Normalizes extracted field values to standard formats."""
@@ -21,54 +89,23 @@ class FieldNormalizer:
         fields = extraction_result.get('fields', {})
 
         # Normalize date fields
-        for date_field in ['date', 'start_date', 'end_date']:
-            if date_field in fields and fields[date_field]:
-                value = fields[date_field].get('value')
-                if value:
-                    normalized = self._normalize_date(value)
-                    if normalized != value:
-                        fields[date_field]['value'] = normalized
-                        fields[date_field]['normalized'] = True
+        for date_field in _DATE_FIELDS:
+            _normalize_field(fields, date_field, self._normalize_date)
 
         # Normalize time fields
-        for time_field in ['time', 'start_time', 'end_time']:
-            if time_field in fields and fields[time_field]:
-                value = fields[time_field].get('value')
-                if value:
-                    normalized = self._normalize_time(value)
-                    if normalized != value:
-                        fields[time_field]['value'] = normalized
-                        fields[time_field]['normalized'] = True
+        for time_field in _TIME_FIELDS:
+            _normalize_field(fields, time_field, self._normalize_time)
 
         # Normalize phone
-        if 'contact_phone' in fields and fields['contact_phone']:
-            value = fields['contact_phone'].get('value')
-            if value:
-                normalized = self._normalize_phone(value)
-                if normalized != value:
-                    fields['contact_phone']['value'] = normalized
-                    fields['contact_phone']['normalized'] = True
+        _normalize_field(fields, 'contact_phone', self._normalize_phone)
 
         # Normalize email
-        if 'contact_email' in fields and fields['contact_email']:
-            value = fields['contact_email'].get('value')
-            if value:
-                normalized = self._normalize_email(value)
-                if normalized != value:
-                    fields['contact_email']['value'] = normalized
-                    fields['contact_email']['normalized'] = True
+        _normalize_field(fields, 'contact_email', self._normalize_email)
 
         # Normalize URLs
-        for url_field in ['website', 'registration_link']:
-            if url_field in fields and fields[url_field]:
-                value = fields[url_field].get('value')
-                if value:
-                    normalized = self._normalize_url(value)
-                    if normalized != value:
-                        fields[url_field]['value'] = normalized
-                        fields[url_field]['normalized'] = True
-
-        extraction_result['fields'] = fields
+        for url_field in _URL_FIELDS:
+            _normalize_field(fields, url_field, self._normalize_url)
+
         return extraction_result
 
     def _normalize_date(self, date_str: str) -> str:
@@ -80,6 +117,14 @@ class FieldNormalizer:
         Returns:
             ISO 8601 formatted date or original string if parsing fails
         """
+        # Fast path: exact formats are far cheaper than dateparser
+        candidate = date_str.strip()
+        for fmt in _FAST_FORMATS:
+            try:
+                return datetime.strptime(candidate, fmt).date().isoformat()
+            except ValueError:
+                continue
+
         try:
             parsed = dateparser.parse(
                 date_str,
@@ -103,7 +148,7 @@ class FieldNormalizer:
         """
         # Handle ranges like "9am-5pm" or "09:00-17:00"
         if '-' in time_str or 'to' in time_str.lower():
-            parts = re.split(r'\s*-\s*|\s+to\s+', time_str, flags=re.IGNORECASE)
+            parts = _TIME_RANGE_SEP.split(time_str)
             if len(parts) == 2:
                 start = self._convert_to_24h(parts[0].strip())
                 end = self._convert_to_24h(parts[1].strip())
@@ -124,33 +169,20 @@ class FieldNormalizer:
             24-hour formatted time (HH:MM) or None if parsing fails
         """
         # Pattern for HH:MM with optional am/pm
-        pattern = r'(\d{1,2}):(\d{2})\s*([ap]m)?'
-        match = re.search(pattern, time_str, re.IGNORECASE)
+        match = _TIME_HHMM.search(time_str)
 
         if match:
             hour = int(match.group(1))
             minute = match.group(2)
-            meridiem = match.group(3).lower() if match.group(3) else None
-
-            if meridiem == 'pm' and hour < 12:
-                hour += 12
-            elif meridiem == 'am' and hour == 12:
-                hour = 0
+            hour = _apply_meridiem(hour, match.group(3))
 
             return f"{hour:02d}:{minute}"
 
         # Pattern for just hour with am/pm
-        pattern = r'(\d{1,2})\s*([ap]m)'
-        match = re.search(pattern, time_str, re.IGNORECASE)
+        match = _TIME_HH.search(time_str)
 
         if match:
-            hour = int(match.group(1))
-            meridiem = match.group(2).lower()
-
-            if meridiem == 'pm' and hour < 12:
-                hour += 12
-            elif meridiem == 'am' and hour == 12:
-                hour = 0
+            hour = _apply_meridiem(int(match.group(1)), match.group(2))
 
             return f"{hour:02d}:00"
 
@@ -166,7 +198,7 @@ class FieldNormalizer:
             Formatted phone number (US format if applicable)
         """
         # Remove all non-digits
-        digits = re.sub(r'\D', '', phone)
+        digits = _NON_DIGIT.sub('', phone)
 
         # Format US numbers
         if len(digits) == 10:
@@ -1,23 +1,24 @@
 """Field validation and confidence scoring."""
 
-from typing import Dict, Any, List, Set
+from typing import Dict, Any, FrozenSet, List
 
-from app.core.schemas import Warning
+# Fields with a value but confidence below this are flagged
+LOW_FIELD_CONFIDENCE = 0.6
 
 
 class FieldValidator:
     """Validates extracted fields and calculates confidence scores."""
 
     # Core fields that are expected in most event posters
-    CORE_FIELDS: Set[str] = {
+    CORE_FIELDS: FrozenSet[str] = frozenset({
         'event_name', 'date', 'time', 'venue_name', 'venue_address',
         'description', 'organizer', 'contact_email', 'contact_phone',
         'ticket_price', 'website', 'registration_link',
         'start_date', 'end_date', 'start_time', 'end_time'
-    }
+    })
 
     # Critical fields that should trigger warnings if missing
-    CRITICAL_FIELDS: Set[str] = {'event_name', 'date', 'venue_name'}
+    CRITICAL_FIELDS: FrozenSet[str] = frozenset({'event_name', 'date', 'venue_name'})
 
     def validate(self, extraction_result: Dict[str, Any]) -> Dict[str, Any]:
         """Validate extraction result and add warnings.
@@ -30,63 +31,62 @@ class FieldValidator:
         """
         fields = extraction_result.get('fields', {})
 
-        # Calculate overall confidence
+        # Same rules as is_extraction_sufficient(), so the two never disagree
         overall_confidence = self._calculate_overall_confidence(fields)
         extraction_result['confidence'] = overall_confidence
+        missing_critical = self._check_critical_fields(fields)
+        low_confidence_fields = self._find_low_confidence_fields(fields)
 
-        # Check for missing critical fields
+        # Warnings are plain dicts in the schemas.Warning shape (all keys
+        # present, as model_dump() produced)
         warnings = []
-        missing_critical = self._check_critical_fields(fields)
 
+        # Check for missing critical fields
         if missing_critical:
-            warnings.append(Warning(
-                type="missing_critical_fields",
-                fields=missing_critical,
-                message=f"Missing critical fields: {', '.join(missing_critical)}"
-            ))
+            warnings.append({
+                'type': "missing_critical_fields",
+                'fields': missing_critical,
+                'confidence': None,
+                'message': f"Missing critical fields: {', '.join(missing_critical)}"
+            })
 
         # Check for low confidence
         if overall_confidence < 0.6:
-            warnings.append(Warning(
-                type="low_confidence",
-                confidence=overall_confidence,
-                message=f"Overall confidence is low ({overall_confidence:.2f})"
-            ))
+            warnings.append({
+                'type': "low_confidence",
+                'fields': None,
+                'confidence': overall_confidence,
+                'message': f"Overall confidence is low ({overall_confidence:.2f})"
+            })
 
         # Check for low field-specific confidence
-        low_confidence_fields = self._check_low_confidence_fields(fields)
         if low_confidence_fields:
-            warnings.append(Warning(
-                type="low_field_confidence",
-                fields=low_confidence_fields,
-                message=f"Some fields have low confidence: {', '.join(low_confidence_fields)}"
-            ))
+            warnings.append({
+                'type': "low_field_confidence",
+                'fields': low_confidence_fields,
+                'confidence': None,
+                'message': f"Some fields have low confidence: {', '.join(low_confidence_fields)}"
+            })
 
-        extraction_result['warnings'] = [w.model_dump() for w in warnings]
+        extraction_result['warnings'] = warnings
 
         return extraction_result
 
     def _calculate_overall_confidence(self, fields: Dict[str, Any]) -> float:
-        """Calculate average confidence across all fields.
+        """Average the numeric confidences of all fields.
 
         Args:
             fields: Dictionary of extracted fields
 
         Returns:
-            Average confidence score (0-1)
+            Mean field confidence rounded to 2 decimals, or 0.0 if none
         """
-        confidences = []
-
-        for field_name, field_data in fields.items():
-            if field_data and isinstance(field_data, dict):
-                confidence = field_data.get('confidence')
-                if confidence is not None and isinstance(confidence, (int, float)):
-                    confidences.append(confidence)
-
-        if not confidences:
-            return 0.0
-
-        return round(sum(confidences) / len(confidences), 2)
+        confidences = [
+            field_data['confidence'] for field_data in fields.values()
+            if isinstance(field_data, dict)
+            and isinstance(field_data.get('confidence'), (int, float))
+        ]
+        return round(sum(confidences) / len(confidences), 2) if confidences else 0.0
 
     def _check_critical_fields(self, fields: Dict[str, Any]) -> List[str]:
         """Check for missing critical fields.
@@ -95,45 +95,30 @@ class FieldValidator:
             fields: Dictionary of extracted fields
 
         Returns:
-            List of missing critical field names
+            Sorted list of missing critical field names
         """
-        missing = []
-
-        for critical_field in self.CRITICAL_FIELDS:
-            field_data = fields.get(critical_field)
+        # A field counts as present only with a non-empty value
+        present = {
+            name for name in self.CRITICAL_FIELDS
+            if isinstance(fields.get(name), dict) and fields[name].get('value')
+        }
+        return sorted(self.CRITICAL_FIELDS - present)
 
-            # Check if field is missing or has null/empty value
-            if not field_data or not field_data.get('value'):
-                missing.append(critical_field)
-
-        return missing
-
-    def _check_low_confidence_fields(
-        self,
-        fields: Dict[str, Any],
-        threshold: float = 0.6
-    ) -> List[str]:
-        """Identify fields with low confidence scores.
+    def _find_low_confidence_fields(self, fields: Dict[str, Any]) -> List[str]:
+        """Find fields that have a value but low confidence.
 
         Args:
             fields: Dictionary of extracted fields
-            threshold: Confidence threshold (default: 0.6)
 
         Returns:
-            List of field names with low confidence
+            Names of flagged fields, in extraction order
         """
-        low_confidence = []
-
-        for field_name, field_data in fields.items():
-            if field_data and isinstance(field_data, dict):
-                confidence = field_data.get('confidence')
-                value = field_data.get('value')
-
-                # Only flag if field has a value but low confidence
-                if value and confidence is not None and confidence < threshold:
-                    low_confidence.append(field_name)
-
-        return low_confidence
+        return [
+            name for name, field_data in fields.items()
+            if isinstance(field_data, dict) and field_data.get('value')
+            and isinstance(field_data.get('confidence'), (int, float))
+            and field_data['confidence'] < LOW_FIELD_CONFIDENCE
+        ]
 
     def is_extraction_sufficient(
         self,
@@ -152,7 +137,11 @@ class FieldValidator:
             True if extraction is sufficient, False if fallback needed
         """
         fields = extraction_result.get('fields', {})
-        overall_confidence = extraction_result.get('confidence', 0.0)
+
+        # Route results are checked before validate() has scored them
+        overall_confidence = extraction_result.get('confidence')
+        if overall_confidence is None:
+            overall_confidence = self._calculate_overall_confidence(fields)
 
         # Check if critical fields are present
         missing_critical = self._check_critical_fields(fields)
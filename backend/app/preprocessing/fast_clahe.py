@@ -0,0 +1,192 @@
+"""Parallel CLAHE compiled with Numba.
+
+cv2.CLAHE.apply processes one image on a single thread. Here the per-tile
+histograms and the per-pixel interpolation are both spread across cores
+with prange. Results follow OpenCV's CLAHE: tiles are padded with
+BORDER_REFLECT_101, histograms are clipped and redistributed the same way,
+and the four neighbouring tile LUTs are blended bilinearly.
+"""
+
+import math
+
+import numpy as np
+from numba import njit, prange
+
+HIST_SIZE = 256
+
+
+@njit(inline="always")
+def _reflect101(i, n):
+    """Map an out-of-range index onto the image (cv2.BORDER_REFLECT_101)."""
+    if n == 1:
+        return 0
+    while i < 0 or i >= n:
+        if i < 0:
+            i = -i
+        else:
+            i = 2 * n - 2 - i
+    return i
+
+
+def tile_size(height: int, width: int, tile_grid: tuple) -> tuple:
+    """CLAHE tile size for an image, as cv2.CLAHE computes it.
+
+    When either side is not a multiple of the grid, OpenCV pads the image by
+    tiles - side % tiles on both sides, so a side that already divides
+    evenly still grows by one pixel per tile.
+
+    Args:
+        height: Image height in pixels
+        width: Image width in pixels
+        tile_grid: Grid as (columns, rows), like OpenCV's tileGridSize
+
+    Returns:
+        (tile_h, tile_w) in pixels
+    """
+    tiles_x, tiles_y = tile_grid
+    if height % tiles_y == 0 and width % tiles_x == 0:
+        return height // tiles_y, width // tiles_x
+    return (
+        (height + tiles_y - height % tiles_y) // tiles_y,
+        (width + tiles_x - width % tiles_x) // tiles_x
+    )
+
+
+@njit(inline="always")
+def _clip_limit(clip, tile_area):
+    """Per-bin histogram limit for a tile, or 0 when clipping is disabled."""
+    if clip <= 0:
+        return 0
+    return max(int(clip * tile_area / HIST_SIZE), 1)
+
+
+@njit(inline="always")
+def _hist_to_lut(hist, limit, tile_area, lut):
+    """Clip a tile histogram, redistribute the excess and build its LUT.
+
+    Args:
+        hist: Int32 histogram of the tile (modified in place)
+        limit: Per-bin limit from _clip_limit
+        tile_area: Number of pixels in the tile
+        lut: Uint8 output table of HIST_SIZE entries
+    """
+    if limit > 0:
+        clipped = 0
+        for i in range(HIST_SIZE):
+            if hist[i] > limit:
+                clipped += hist[i] - limit
+                hist[i] = limit
+
+        batch = clipped // HIST_SIZE
+        residual = clipped - batch * HIST_SIZE
+        for i in range(HIST_SIZE):
+            hist[i] += batch
+
+        if residual > 0:
+            step = max(HIST_SIZE // residual, 1)
+            j = 0
+            while j < HIST_SIZE and residual > 0:
+                hist[j] += 1
+                j += step
+                residual -= 1
+
+    lut_scale = (HIST_SIZE - 1) / tile_area
+    total = 0
+    for i in range(HIST_SIZE):
+        total += hist[i]
+        lut[i] = min(255, int(np.rint(total * lut_scale)))
+
+
+@njit(parallel=True, cache=True)
+def _tile_luts(src, clip, tiles_y, tiles_x, tile_h, tile_w):
+    """Build one LUT per tile of a grayscale image, in parallel over tiles.
+
+    Args:
+        src: Uint8 grayscale image
+        clip: CLAHE clip limit (OpenCV clipLimit)
+        tiles_y: Number of tile rows
+        tiles_x: Number of tile columns
+        tile_h: Tile height in pixels
+        tile_w: Tile width in pixels
+
+    Returns:
+        Uint8 array of shape (tiles_y, tiles_x, 256)
+    """
+    height, width = src.shape
+    luts = np.empty((tiles_y, tiles_x, HIST_SIZE), dtype=np.uint8)
+    limit = _clip_limit(clip, tile_h * tile_w)
+
+    for t in prange(tiles_y * tiles_x):
+        ty = t // tiles_x
+        tx = t % tiles_x
+
+        hist = np.zeros(HIST_SIZE, dtype=np.int32)
+        for y in range(ty * tile_h, (ty + 1) * tile_h):
+            sy = _reflect101(y, height)
+            for x in range(tx * tile_w, (tx + 1) * tile_w):
+                hist[src[sy, _reflect101(x, width)]] += 1
+
+        _hist_to_lut(hist, limit, tile_h * tile_w, luts[ty, tx])
+
+    return luts
+
+
+@njit(parallel=True, cache=True)
+def _interpolate(src, dst, luts, tile_h, tile_w):
+    """Blend the four neighbouring tile LUTs for every pixel, in parallel over rows.
+
+    Args:
+        src: Uint8 grayscale image
+        dst: Uint8 output image of the same shape
+        luts: Tables from _tile_luts
+        tile_h: Tile height in pixels
+        tile_w: Tile width in pixels
+    """
+    height, width = src.shape
+    tiles_y, tiles_x = luts.shape[0], luts.shape[1]
+    inv_tile_h = 1.0 / tile_h
+    inv_tile_w = 1.0 / tile_w
+
+    for y in prange(height):
+        tyf = y * inv_tile_h - 0.5
+        ty1 = int(math.floor(tyf))
+        ya = tyf - ty1
+        ty2 = min(ty1 + 1, tiles_y - 1)
+        ty1 = max(ty1, 0)
+
+        for x in range(width):
+            txf = x * inv_tile_w - 0.5
+            tx1 = int(math.floor(txf))
+            xa = txf - tx1
+            tx2 = min(tx1 + 1, tiles_x - 1)
+            tx1 = max(tx1, 0)
+
+            v = src[y, x]
+            top = luts[ty1, tx1, v] * (1.0 - xa) + luts[ty1, tx2, v] * xa
+            bottom = luts[ty2, tx1, v] * (1.0 - xa) + luts[ty2, tx2, v] * xa
+            dst[y, x] = min(255, int(np.rint(top * (1.0 - ya) + bottom * ya)))
+
+
+def clahe_u8(src: np.ndarray, clip_limit: float, tile_grid: tuple) -> np.ndarray:
+    """Contrast Limited Adaptive Histogram Equalization of a uint8 image.
+
+    Equivalent to cv2.createCLAHE(clip_limit, tile_grid).apply(src).
+
+    Args:
+        src: Grayscale uint8 image
+        clip_limit: CLAHE clip limit
+        tile_grid: Grid as (columns, rows), like OpenCV's tileGridSize
+
+    Returns:
+        Equalized grayscale uint8 image
+    """
+    height, width = src.shape
+    tiles_x, tiles_y = tile_grid
+    tile_h, tile_w = tile_size(height, width, tile_grid)
+
+    src = np.ascontiguousarray(src)
+    luts = _tile_luts(src, float(clip_limit), tiles_y, tiles_x, tile_h, tile_w)
+
+    dst = np.empty_like(src)
+    _interpolate(src, dst, luts, tile_h, tile_w)
+    return dst
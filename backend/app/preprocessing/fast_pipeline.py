@@ -0,0 +1,259 @@
+"""Fused grayscale + CLAHE + bilateral preprocessing compiled with Numba.
+
+ImageProcessor normally walks the image three times (cvtColor, CLAHE,
+bilateralFilter), reading and writing a full plane on every pass. The fused
+kernel reads the BGR image once to build the CLAHE tables and once more to
+produce the output: each 64x64 block computes gray and CLAHE values for
+itself plus the filter halo in a small scratch buffer, then filters from it.
+Results follow OpenCV's semantics for all three steps.
+"""
+
+import math
+from typing import NamedTuple
+
+import numpy as np
+from numba import njit, prange
+
+from app.preprocessing.fast_clahe import HIST_SIZE, _clip_limit, _hist_to_lut, _reflect101, tile_size
+
+# Output block size; block plus halo stays resident in L1/L2
+BLOCK_SIZE = 64
+
+# Bilateral weights are Q16 fixed point; the product of a spatial and a range
+# weight is shifted back down to Q16
+WEIGHT_ONE = 65535
+WEIGHT_SHIFT = 16
+
+
+class BilateralTables(NamedTuple):
+    """Precomputed fixed-point weights for the fused bilateral filter."""
+
+    radius: int
+    offsets: np.ndarray  # Int32 (K, 2) array of (dy, dx) window offsets
+    space_lut: np.ndarray  # Uint16 spatial weight for each offset
+    range_lut: np.ndarray  # Uint16 range weight indexed by absolute difference
+
+
+def bilateral_tables(diameter: int, sigma_color: float, sigma_space: float) -> BilateralTables:
+    """Build the bilateral weight tables once for a set of parameters.
+
+    Args:
+        diameter: Bilateral window diameter in pixels
+        sigma_color: Bilateral range sigma
+        sigma_space: Bilateral spatial sigma
+
+    Returns:
+        BilateralTables for fused_preprocess
+    """
+    # Circular window, as cv2.bilateralFilter uses
+    radius = diameter // 2
+    offsets = []
+    space_weights = []
+    for dy in range(-radius, radius + 1):
+        for dx in range(-radius, radius + 1):
+            distance_sq = dy * dy + dx * dx
+            if math.sqrt(distance_sq) > radius:
+                continue
+            offsets.append((dy, dx))
+            space_weights.append(math.exp(-0.5 * distance_sq / (sigma_space * sigma_space)))
+
+    levels = np.arange(HIST_SIZE, dtype=np.float64)
+    range_weights = np.exp(-0.5 * levels * levels / (sigma_color * sigma_color))
+
+    return BilateralTables(
+        radius=radius,
+        offsets=np.array(offsets, dtype=np.int32),
+        space_lut=np.rint(np.array(space_weights) * WEIGHT_ONE).astype(np.uint16),
+        range_lut=np.rint(range_weights * WEIGHT_ONE).astype(np.uint16)
+    )
+
+
+@njit(inline="always")
+def _gray(bgr, y, x):
+    """BGR to gray with cv2.cvtColor's Q15 fixed-point coefficients."""
+    return (
+        np.int32(bgr[y, x, 0]) * 3735
+        + np.int32(bgr[y, x, 1]) * 19235
+        + np.int32(bgr[y, x, 2]) * 9798
+        + 16384
+    ) >> 15
+
+
+@njit(parallel=True, cache=True)
+def _clahe_luts(bgr, clip_limit, tiles_y, tiles_x, tile_h, tile_w):
+    """Build one clipped-histogram LUT per CLAHE tile.
+
+    Tiles cover the image padded with BORDER_REFLECT_101 to a multiple of
+    the grid, as OpenCV does.
+
+    Args:
+        bgr: Uint8 image, shape (H, W, 3)
+        clip_limit: CLAHE clip limit (OpenCV clipLimit)
+        tiles_y: Number of tile rows
+        tiles_x: Number of tile columns
+        tile_h: Tile height in pixels
+        tile_w: Tile width in pixels
+
+    Returns:
+        Uint8 array of shape (tiles_y, tiles_x, 256)
+    """
+    height, width = bgr.shape[0], bgr.shape[1]
+    luts = np.empty((tiles_y, tiles_x, HIST_SIZE), dtype=np.uint8)
+
+    limit = _clip_limit(clip_limit, tile_h * tile_w)
+
+    for t in prange(tiles_y * tiles_x):
+        ty = t // tiles_x
+        tx = t % tiles_x
+
+        hist = np.zeros(HIST_SIZE, dtype=np.int32)
+        for y in range(ty * tile_h, (ty + 1) * tile_h):
+            sy = _reflect101(y, height)
+            for x in range(tx * tile_w, (tx + 1) * tile_w):
+                hist[_gray(bgr, sy, _reflect101(x, width))] += 1
+
+        _hist_to_lut(hist, limit, tile_h * tile_w, luts[ty, tx])
+
+    return luts
+
+
+@njit(parallel=True, cache=True)
+def _filter_blocks(bgr, luts, tile_h, tile_w, radius, offsets, space_lut, range_lut):
+    """Compute CLAHE output per block with halo and bilateral-filter it.
+
+    Args:
+        bgr: Uint8 image, shape (H, W, 3)
+        luts: CLAHE tables from _clahe_luts
+        tile_h: CLAHE tile height in pixels
+        tile_w: CLAHE tile width in pixels
+        radius: Bilateral window radius
+        offsets: Int32 (K, 2) array of (dy, dx) window offsets
+        space_lut: Uint16 Q16 spatial weight for each offset
+        range_lut: Uint16 Q16 range weight indexed by absolute difference
+
+    Returns:
+        Uint8 denoised grayscale image, shape (H, W)
+    """
+    height, width = bgr.shape[0], bgr.shape[1]
+    tiles_y, tiles_x = luts.shape[0], luts.shape[1]
+    out = np.empty((height, width), dtype=np.uint8)
+
+    blocks_y = (height + BLOCK_SIZE - 1) // BLOCK_SIZE
+    blocks_x = (width + BLOCK_SIZE - 1) // BLOCK_SIZE
+    span = BLOCK_SIZE + 2 * radius
+
+    inv_tile_h = 1.0 / tile_h
+    inv_tile_w = 1.0 / tile_w
+
+    for b in prange(blocks_y * blocks_x):
+        y0 = (b // blocks_x) * BLOCK_SIZE
+        x0 = (b % blocks_x) * BLOCK_SIZE
+        y1 = min(y0 + BLOCK_SIZE, height)
+        x1 = min(x0 + BLOCK_SIZE, width)
+
+        # CLAHE values for the block and its halo (border pixels reflected)
+        scratch = np.empty((span, span), dtype=np.int32)
+        for sy in range(y1 - y0 + 2 * radius):
+            y = _reflect101(y0 - radius + sy, height)
+
+            tyf = y * inv_tile_h - 0.5
+            ty1 = int(math.floor(tyf))
+            ya = tyf - ty1
+            ty2 = min(ty1 + 1, tiles_y - 1)
+            ty1 = max(ty1, 0)
+
+            for sx in range(x1 - x0 + 2 * radius):
+                x = _reflect101(x0 - radius + sx, width)
+
+                txf = x * inv_tile_w - 0.5
+                tx1 = int(math.floor(txf))
+                xa = txf - tx1
+                tx2 = min(tx1 + 1, tiles_x - 1)
+                tx1 = max(tx1, 0)
+
+                v = _gray(bgr, y, x)
+                top = luts[ty1, tx1, v] * (1.0 - xa) + luts[ty1, tx2, v] * xa
+                bottom = luts[ty2, tx1, v] * (1.0 - xa) + luts[ty2, tx2, v] * xa
+                scratch[sy, sx] = min(255, int(np.rint(top * (1.0 - ya) + bottom * ya)))
+
+        # Length of the run of equal values ending at each scratch pixel, so a
+        # window row is uniform when the run at its right edge spans it
+        runs = np.empty((span, span), dtype=np.int32)
+        for sy in range(y1 - y0 + 2 * radius):
+            runs[sy, 0] = 1
+            for sx in range(1, x1 - x0 + 2 * radius):
+                if scratch[sy, sx] == scratch[sy, sx - 1]:
+                    runs[sy, sx] = runs[sy, sx - 1] + 1
+                else:
+                    runs[sy, sx] = 1
+
+        # Bilateral filter over the scratch buffer
+        window = 2 * radius + 1
+        for y in range(y0, y1):
+            cy = y - y0 + radius
+            for x in range(x0, x1):
+                cx = x - x0 + radius
+                center = scratch[cy, cx]
+
+                # Flat background: every weight multiplies the same value, so
+                # the output is the center pixel itself
+                uniform = True
+                for dy in range(-radius, radius + 1):
+                    if runs[cy + dy, cx + radius] < window or scratch[cy + dy, cx] != center:
+                        uniform = False
+                        break
+                if uniform:
+                    out[y, x] = center
+                    continue
+
+                # Integer multiply-accumulate; the center tap keeps weight_sum > 0
+                total = 0
+                weight_sum = 0
+                for k in range(offsets.shape[0]):
+                    value = scratch[cy + offsets[k, 0], cx + offsets[k, 1]]
+                    w = (np.int64(space_lut[k]) * range_lut[abs(value - center)]) >> WEIGHT_SHIFT
+                    total += w * value
+                    weight_sum += w
+                out[y, x] = min(255, (total + weight_sum // 2) // weight_sum)
+
+    return out
+
+
+def fused_preprocess(
+    bgr: np.ndarray,
+    clip_limit: float,
+    tile_grid: tuple,
+    tables: BilateralTables
+) -> np.ndarray:
+    """Grayscale conversion, CLAHE and bilateral filtering in one kernel.
+
+    Equivalent to cv2.cvtColor(BGR2GRAY), cv2.createCLAHE(clip_limit,
+    tile_grid).apply and cv2.bilateralFilter with the parameters the tables
+    were built from, up to fixed-point rounding.
+
+    Args:
+        bgr: Color uint8 image, shape (H, W, 3)
+        clip_limit: CLAHE clip limit
+        tile_grid: CLAHE grid as (columns, rows), like OpenCV's tileGridSize
+        tables: Bilateral weights from bilateral_tables
+
+    Returns:
+        Denoised grayscale uint8 image
+    """
+    height, width = bgr.shape[:2]
+    tiles_x, tiles_y = tile_grid
+    tile_h, tile_w = tile_size(height, width, tile_grid)
+
+    bgr = np.ascontiguousarray(bgr)
+    luts = _clahe_luts(bgr, float(clip_limit), tiles_y, tiles_x, tile_h, tile_w)
+
+    return _filter_blocks(
+        bgr,
+        luts,
+        tile_h,
+        tile_w,
+        tables.radius,
+        tables.offsets,
+        tables.space_lut,
+        tables.range_lut
+    )
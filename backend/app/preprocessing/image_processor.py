@@ -1,13 +1,169 @@
 """Image preprocessing using OpenCV for OCR optimization."""
 
+import asyncio
+import hashlib
+import logging
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
 import cv2
 import numpy as np
-from typing import Tuple
+from typing import Optional, Tuple
 from PIL import Image
 import io
 
 from app.config import Settings
 
+try:
+    from app.preprocessing.fast_clahe import clahe_u8
+    from app.preprocessing.fast_pipeline import bilateral_tables, fused_preprocess
+except ImportError:  # numba is optional; only needed for PREPROCESS_BACKEND=numba
+    clahe_u8 = fused_preprocess = bilateral_tables = None
+
+try:
+    import xxhash
+except ImportError:  # xxhash is optional; cache keys fall back to blake2b
+    xxhash = None
+
+try:
+    from turbojpeg import TurboJPEG, TJPF_BGR
+except ImportError:  # PyTurboJPEG is optional; cv2 decodes JPEGs without it
+    TurboJPEG = None
+
+logger = logging.getLogger(__name__)
+
+# Edge-preserving denoise parameters (cv2.bilateralFilter semantics)
+BILATERAL_DIAMETER = 9
+BILATERAL_SIGMA_COLOR = 75.0
+BILATERAL_SIGMA_SPACE = 75.0
+
+# Guided filter parameters: radius matches the bilateral window and eps is
+# the squared range sigma
+GUIDED_RADIUS = BILATERAL_DIAMETER // 2
+GUIDED_EPS = BILATERAL_SIGMA_COLOR ** 2
+
+DENOISE_METHODS = ("bilateral", "guided")
+
+PREPROCESS_BACKENDS = ("opencv", "numba")
+
+PREPROCESS_DEVICES = ("cpu", "cuda")
+
+# Image shapes whose scratch buffers each thread keeps. Uploads cluster around
+# a few sizes (phone photos, page scans), so a handful covers most requests.
+SCRATCH_SHAPES = 4
+
+# Sauvola binarization parameters (OCR_BINARIZE)
+SAUVOLA_BLOCK_SIZE = 31
+SAUVOLA_K = 0.2
+
+# JPEG decoders can downscale by these factors in the DCT domain
+_REDUCED_DECODE_FLAGS = (
+    (8, cv2.IMREAD_REDUCED_COLOR_8),
+    (4, cv2.IMREAD_REDUCED_COLOR_4),
+    (2, cv2.IMREAD_REDUCED_COLOR_2),
+)
+
+# EXIF tag holding the camera orientation (1 = upright)
+_EXIF_ORIENTATION = 0x0112
+
+# Build information lines describing the SIMD code paths OpenCV can use
+_CPU_FEATURE_PREFIXES = ("Baseline:", "Dispatched code generation:")
+
+
+def _content_key(image_bytes: bytes) -> Tuple[int, int]:
+    """Hash image bytes for the preprocessing cache.
+
+    Args:
+        image_bytes: Raw image bytes
+
+    Returns:
+        Tuple of (length, 64-bit digest)
+    """
+    if xxhash is not None:
+        digest = xxhash.xxh3_64_intdigest(image_bytes)
+    else:
+        digest = int.from_bytes(hashlib.blake2b(image_bytes, digest_size=8).digest(), "little")
+    return len(image_bytes), digest
+
+
+def _cuda_available() -> bool:
+    """Check whether OpenCV was built with CUDA and can see a GPU.
+
+    Returns:
+        True if cv2.cuda has at least one usable device
+    """
+    try:
+        return cv2.cuda.getCudaEnabledDeviceCount() > 0
+    except (AttributeError, cv2.error):
+        return False
+
+
+# Process-wide OpenCV thread count, set by the first ImageProcessor
+_opencv_threads: Optional[int] = None
+_opencv_lock = threading.Lock()
+
+# Preprocessing pool shared by every ImageProcessor, created on first use
+_pool: Optional[ThreadPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def _configure_opencv(threads: int) -> None:
+    """Apply the process-wide OpenCV settings once.
+
+    Enables the SIMD dispatch paths and caps OpenCV's internal thread pool
+    so concurrent requests do not oversubscribe the CPU.
+
+    Args:
+        threads: cv2.setNumThreads value (OCV_THREADS)
+    """
+    global _opencv_threads
+    with _opencv_lock:
+        if _opencv_threads is not None:
+            if threads != _opencv_threads:
+                logger.warning(f"OpenCV already uses {_opencv_threads} threads, ignoring OCV_THREADS={threads}")
+            return
+        cv2.setUseOptimized(True)
+        cv2.setNumThreads(threads)
+        _opencv_threads = threads
+    _log_cpu_features()
+
+
+def _get_pool(max_workers: int) -> ThreadPoolExecutor:
+    """Get the shared preprocessing pool, creating it on first use.
+
+    Args:
+        max_workers: Pool size if it has to be created
+
+    Returns:
+        Shared thread pool
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="preprocess")
+        return _pool
+
+
+def shutdown_preprocess_pool() -> None:
+    """Shut down the shared preprocessing pool; the next request creates a new one."""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=False)
+
+
+@lru_cache(maxsize=1)
+def _log_cpu_features() -> None:
+    """Log the CPU features OpenCV was built for, once per process."""
+    for line in cv2.getBuildInformation().splitlines():
+        line = line.strip()
+        if line.startswith(_CPU_FEATURE_PREFIXES):
+            logger.info(f"OpenCV {line}")
+
 
 class ImageProcessor:
     """Preprocesses images for OCR and complexity analysis."""
@@ -19,12 +175,144 @@ class ImageProcessor:
             config: Application settings
         """
         self.max_dimension = config.PREPROCESS_MAX_DIM
+        self.ocr_max_dimension = min(config.OCR_MAX_DIM, config.PREPROCESS_MAX_DIM)
         self.clahe_clip_limit = config.CLAHE_CLIP_LIMIT
         self.clahe_grid_size = config.CLAHE_GRID_SIZE
 
+        _configure_opencv(config.OCV_THREADS)
+
+        if config.DENOISE_METHOD not in DENOISE_METHODS:
+            raise ValueError(
+                f"Unknown DENOISE_METHOD: {config.DENOISE_METHOD}. "
+                f"Supported methods: {', '.join(DENOISE_METHODS)}"
+            )
+        if config.DENOISE_METHOD == "guided" and not hasattr(cv2, "ximgproc"):
+            raise ValueError("DENOISE_METHOD=guided requires opencv-contrib-python")
+        self.denoise_method = config.DENOISE_METHOD
+
+        if config.PREPROCESS_BACKEND not in PREPROCESS_BACKENDS:
+            raise ValueError(
+                f"Unknown PREPROCESS_BACKEND: {config.PREPROCESS_BACKEND}. "
+                f"Supported backends: {', '.join(PREPROCESS_BACKENDS)}"
+            )
+        if config.PREPROCESS_BACKEND == "numba" and fused_preprocess is None:
+            raise ValueError("PREPROCESS_BACKEND=numba requires numba to be installed")
+        self.backend = config.PREPROCESS_BACKEND
+
+        if config.OCR_BINARIZE and not hasattr(cv2, "ximgproc"):
+            raise ValueError("OCR_BINARIZE requires opencv-contrib-python")
+        self.binarize = config.OCR_BINARIZE
+
+        if config.PREPROCESS_DEVICE not in PREPROCESS_DEVICES:
+            raise ValueError(
+                f"Unknown PREPROCESS_DEVICE: {config.PREPROCESS_DEVICE}. "
+                f"Supported devices: {', '.join(PREPROCESS_DEVICES)}"
+            )
+        self.use_cuda = config.PREPROCESS_DEVICE == "cuda" and _cuda_available()
+        if config.PREPROCESS_DEVICE == "cuda" and not self.use_cuda:
+            logger.warning("PREPROCESS_DEVICE=cuda but OpenCV has no usable CUDA device, using CPU")
+
+        if self.backend == "numba":
+            # Bilateral weights depend only on the fixed parameters
+            self._bilateral_tables = bilateral_tables(
+                BILATERAL_DIAMETER,
+                BILATERAL_SIGMA_COLOR,
+                BILATERAL_SIGMA_SPACE
+            )
+            self._warm_up()
+
+        # LRU of preprocessed images bounded by their total size in bytes.
+        # process() runs in worker threads, so access is serialized.
+        self.cache_max_bytes = config.PREPROCESS_CACHE_MB * 1024 * 1024
+        self._cache: "OrderedDict[Tuple[int, int], Tuple[np.ndarray, np.ndarray]]" = OrderedDict()
+        self._cache_bytes = 0
+        self._cache_lock = threading.Lock()
+
+        # process() runs concurrently in worker threads; CLAHE objects are not
+        # thread-safe and scratch buffers must not be shared, so each thread
+        # keeps its own
+        self._local = threading.local()
+
+        # Size of the shared pool used by process_async; OpenCV releases the
+        # GIL, so requests preprocess in parallel without starving the default
+        # executor
+        self.workers = config.PREPROCESS_WORKERS or os.cpu_count() or 1
+
+        # libjpeg-turbo's SIMD decoder, when the library can be loaded
+        self._turbojpeg = None
+        if TurboJPEG is not None:
+            try:
+                self._turbojpeg = TurboJPEG()
+            except (OSError, RuntimeError) as e:
+                logger.warning(f"libturbojpeg unavailable, using cv2 for JPEG decode: {e}")
+
     def process(self, image_bytes: bytes) -> Tuple[np.ndarray, np.ndarray]:
         """Process image bytes through preprocessing pipeline.
 
+        Results are cached by content hash, so repeated uploads of the same
+        image skip decoding and filtering. The returned arrays are read-only
+        because they may be shared with other requests.
+
+        Args:
+            image_bytes: Raw image bytes
+
+        Returns:
+            Tuple of (preprocessed_grayscale_image, original_color_image)
+        """
+        if self.cache_max_bytes <= 0:
+            return self._process(image_bytes)
+
+        key = _content_key(image_bytes)
+        with self._cache_lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                return cached
+
+        result = self._process(image_bytes)
+        for array in result:
+            array.setflags(write=False)
+        self._cache_put(key, result)
+
+        return result
+
+    async def process_async(self, image_bytes: bytes) -> Tuple[np.ndarray, np.ndarray]:
+        """Run process() on the preprocessing thread pool.
+
+        Args:
+            image_bytes: Raw image bytes
+
+        Returns:
+            Tuple of (preprocessed_grayscale_image, original_color_image)
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_get_pool(self.workers), self.process, image_bytes)
+
+    def _cache_put(self, key: Tuple[int, int], result: Tuple[np.ndarray, np.ndarray]) -> None:
+        """Store a preprocessing result, evicting least recently used entries.
+
+        Args:
+            key: Content key from _content_key
+            result: Tuple of (preprocessed_grayscale_image, original_color_image)
+        """
+        size = sum(array.nbytes for array in result)
+        if size > self.cache_max_bytes:
+            return
+
+        with self._cache_lock:
+            if key in self._cache:
+                return
+
+            self._cache[key] = result
+            self._cache_bytes += size
+
+            while self._cache_bytes > self.cache_max_bytes:
+                _, evicted = self._cache.popitem(last=False)
+                self._cache_bytes -= sum(array.nbytes for array in evicted)
+
+    def _process(self, image_bytes: bytes) -> Tuple[np.ndarray, np.ndarray]:
+        """Decode, resize and filter an image without consulting the cache.
+
         Args:
             image_bytes: Raw image bytes
 
@@ -32,8 +320,7 @@ class ImageProcessor:
             Tuple of (preprocessed_grayscale_image, original_color_image)
         """
         # Decode image from bytes
-        img_array = np.frombuffer(image_bytes, np.uint8)
-        img = cv2.imdecode(img_array, cv2.IMREAD_COLOR)
+        img = self._decode(image_bytes)
 
         if img is None:
             raise ValueError("Failed to decode image")
@@ -41,45 +328,289 @@ class ImageProcessor:
         # Resize if needed (maintain aspect ratio)
         img = self._resize_if_needed(img)
 
-        # Store original resized image for vision LLM
-        original_img = img.copy()
+        # Keep the resized color image for the vision LLM. Every step below
+        # allocates its own output, so it is shared read-only, not copied.
+        original_img = img
+        original_img.setflags(write=False)
+
+        if self.use_cuda and not self.binarize:
+            return self._process_cuda(img), original_img
+
+        # The grayscale path only feeds OCR and scoring, which do not need
+        # more than OCR_MAX_DIM; filtering cost scales with the area
+        img = self._resize_if_needed(img, self.ocr_max_dimension)
+
+        if self.binarize:
+            # Sauvola thresholding replaces CLAHE and denoising: it adapts to
+            # local contrast itself and its output is already clean
+            gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY, dst=self._scratch("gray", img.shape[:2]))
+            binary = cv2.ximgproc.niBlackThreshold(
+                gray,
+                255,
+                cv2.THRESH_BINARY,
+                blockSize=SAUVOLA_BLOCK_SIZE,
+                k=SAUVOLA_K,
+                binarizationMethod=cv2.ximgproc.BINARIZATION_SAUVOLA
+            )
+            return binary, original_img
+
+        if self.backend == "numba" and self.denoise_method == "bilateral":
+            # One fused kernel instead of three full-image passes
+            denoised = fused_preprocess(
+                img,
+                clip_limit=self.clahe_clip_limit,
+                tile_grid=self.clahe_grid_size,
+                tables=self._bilateral_tables
+            )
+            return denoised, original_img
 
         # Convert to grayscale for OCR processing
-        gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+        # (gray and enhanced are intermediates, so they live in scratch
+        # buffers; the denoised output is returned and always freshly allocated)
+        gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY, dst=self._scratch("gray", img.shape[:2]))
 
         # Apply CLAHE (Contrast Limited Adaptive Histogram Equalization)
-        clahe = cv2.createCLAHE(
-            clipLimit=self.clahe_clip_limit,
-            tileGridSize=self.clahe_grid_size
-        )
-        enhanced = clahe.apply(gray)
+        if self.backend == "numba":
+            enhanced = clahe_u8(gray, self.clahe_clip_limit, self.clahe_grid_size)
+        else:
+            enhanced = self._get_clahe().apply(gray, dst=self._scratch("enhanced", gray.shape))
+
+        # Every stage stays uint8; a float intermediate would multiply the
+        # memory traffic of everything after it
+        assert gray.dtype == np.uint8 and enhanced.dtype == np.uint8
+
+        # Denoise with an edge-preserving filter
+        denoised = self._denoise(enhanced)
+        assert denoised.dtype == np.uint8
+
+        return denoised, original_img
+
+    def _process_cuda(self, img: np.ndarray) -> np.ndarray:
+        """Run the grayscale path on the GPU with OpenCV's CUDA module.
+
+        Each call uses its own CUDA stream, so concurrent requests overlap
+        their uploads, kernels and downloads. Denoise methods other than
+        bilateral have no CUDA version and run on the CPU after download.
+
+        Args:
+            img: Resized BGR image
+
+        Returns:
+            Denoised grayscale image
+        """
+        stream = cv2.cuda_Stream()
+        gpu_img = cv2.cuda_GpuMat()
+        gpu_img.upload(img, stream)
+
+        height, width = img.shape[:2]
+        scale = self.ocr_max_dimension / max(height, width)
+        if scale < 1:
+            gpu_img = cv2.cuda.resize(
+                gpu_img,
+                (max(1, int(width * scale)), max(1, int(height * scale))),
+                interpolation=cv2.INTER_AREA,
+                stream=stream
+            )
+
+        gray = cv2.cuda.cvtColor(gpu_img, cv2.COLOR_BGR2GRAY, stream=stream)
+        enhanced = self._get_cuda_clahe().apply(gray, stream)
 
-        # Denoise using bilateral filter (preserves edges)
-        denoised = cv2.bilateralFilter(
+        if self.denoise_method != "bilateral":
+            result = enhanced.download(stream)
+            stream.waitForCompletion()
+            return self._denoise(result)
+
+        denoised = cv2.cuda.bilateralFilter(
             enhanced,
-            d=9,
-            sigmaColor=75,
-            sigmaSpace=75
+            BILATERAL_DIAMETER,
+            BILATERAL_SIGMA_COLOR,
+            BILATERAL_SIGMA_SPACE,
+            stream=stream
         )
+        result = denoised.download(stream)
+        stream.waitForCompletion()
+        return result
 
-        return denoised, original_img
+    def _get_cuda_clahe(self):
+        """Get this thread's CUDA CLAHE object, creating it on first use.
+
+        Returns:
+            cv2.cuda.CLAHE: Cached CLAHE instance
+        """
+        clahe = getattr(self._local, 'cuda_clahe', None)
+        if clahe is None:
+            clahe = cv2.cuda.createCLAHE(
+                clipLimit=self.clahe_clip_limit,
+                tileGridSize=self.clahe_grid_size
+            )
+            self._local.cuda_clahe = clahe
+        return clahe
+
+    def _get_clahe(self):
+        """Get this thread's CLAHE object, creating it on first use.
+
+        Returns:
+            cv2.CLAHE: Cached CLAHE instance
+        """
+        clahe = getattr(self._local, 'clahe', None)
+        if clahe is None:
+            clahe = cv2.createCLAHE(
+                clipLimit=self.clahe_clip_limit,
+                tileGridSize=self.clahe_grid_size
+            )
+            self._local.clahe = clahe
+        return clahe
 
-    def _resize_if_needed(self, img: np.ndarray) -> np.ndarray:
+    def _scratch(self, name: str, shape: Tuple[int, ...]) -> np.ndarray:
+        """Get this thread's uint8 scratch buffer for an intermediate image.
+
+        Buffers are reused across requests with the same image shape. Only
+        the SCRATCH_SHAPES most recently used shapes are kept, so a stream of
+        differently sized uploads cannot grow memory without bound.
+
+        Args:
+            name: Pipeline stage the buffer is for
+            shape: Required array shape
+
+        Returns:
+            Uninitialized uint8 array of the given shape
+        """
+        shapes = getattr(self._local, 'shapes', None)
+        if shapes is None:
+            shapes = self._local.shapes = OrderedDict()
+
+        buffers = shapes.get(shape)
+        if buffers is None:
+            buffers = shapes[shape] = {}
+            if len(shapes) > SCRATCH_SHAPES:
+                shapes.popitem(last=False)
+        else:
+            shapes.move_to_end(shape)
+
+        buffer = buffers.get(name)
+        if buffer is None:
+            buffer = buffers[name] = np.empty(shape, dtype=np.uint8)
+        return buffer
+
+    def _warm_up(self) -> None:
+        """Compile the Numba kernels at startup instead of on the first request."""
+        dummy = np.zeros((64, 64, 3), dtype=np.uint8)
+        if self.denoise_method == "bilateral":
+            # Numba specializes on writability, and the color image may reach
+            # the kernel either read-only or as a fresh resize output
+            read_only = dummy.copy()
+            read_only.setflags(write=False)
+            for bgr in (dummy, read_only):
+                fused_preprocess(
+                    bgr,
+                    clip_limit=self.clahe_clip_limit,
+                    tile_grid=self.clahe_grid_size,
+                    tables=self._bilateral_tables
+                )
+        else:
+            clahe_u8(dummy[:, :, 0], self.clahe_clip_limit, self.clahe_grid_size)
+
+    def _decode(self, image_bytes: bytes) -> np.ndarray:
+        """Decode image bytes, shrinking large JPEGs during decode.
+
+        JPEGs much larger than max_dimension are decoded at 1/2, 1/4 or 1/8
+        scale, which skips most of the inverse DCT work. The largest factor
+        that still leaves at least max_dimension pixels is used, so the
+        resize step afterwards loses no detail. Other formats are decoded
+        at full size.
+
+        Upright JPEGs go through libjpeg-turbo when PyTurboJPEG is installed.
+        It does not apply EXIF orientation, so rotated photos stay on cv2,
+        which does.
+
+        Args:
+            image_bytes: Raw image bytes
+
+        Returns:
+            BGR image array, or None if decoding fails
+        """
+        img_array = np.frombuffer(image_bytes, np.uint8)
+        flags = cv2.IMREAD_COLOR
+
+        try:
+            # Reads the header only; pixel data is not decoded
+            with Image.open(io.BytesIO(image_bytes)) as probe:
+                image_format = probe.format
+                longest_side = max(probe.size)
+                orientation = probe.getexif().get(_EXIF_ORIENTATION, 1)
+        except Exception:
+            image_format = None
+
+        if image_format != "JPEG":
+            return cv2.imdecode(img_array, flags)
+
+        factor = 1
+        for reduced_factor, reduced_flags in _REDUCED_DECODE_FLAGS:
+            if longest_side // reduced_factor >= self.max_dimension:
+                factor, flags = reduced_factor, reduced_flags
+                break
+
+        if self._turbojpeg is not None and orientation == 1:
+            try:
+                return self._turbojpeg.decode(
+                    image_bytes,
+                    pixel_format=TJPF_BGR,
+                    scaling_factor=(1, factor)
+                )
+            except Exception as e:
+                logger.debug(f"turbojpeg decode failed, falling back to cv2: {e}")
+
+        return cv2.imdecode(img_array, flags)
+
+    def _denoise(self, gray: np.ndarray) -> np.ndarray:
+        """Apply the configured edge-preserving denoise filter.
+
+        Args:
+            gray: Grayscale uint8 image
+
+        Returns:
+            Denoised grayscale uint8 image
+        """
+        if self.denoise_method == "guided":
+            # Four box filters per pixel, independent of the radius
+            return cv2.ximgproc.guidedFilter(
+                guide=gray,
+                src=gray,
+                radius=GUIDED_RADIUS,
+                eps=GUIDED_EPS
+            )
+
+        # Exact bilateral filter (preserves edges)
+        return cv2.bilateralFilter(
+            gray,
+            d=BILATERAL_DIAMETER,
+            sigmaColor=BILATERAL_SIGMA_COLOR,
+            sigmaSpace=BILATERAL_SIGMA_SPACE
+        )
+
+    def _resize_if_needed(self, img: np.ndarray, max_dimension: Optional[int] = None) -> np.ndarray:
         """Resize image if it exceeds maximum dimension.
 
         Args:
             img: Input image array
+            max_dimension: Size limit (defaults to PREPROCESS_MAX_DIM)
 
         Returns:
             Resized image or original if no resize needed
         """
+        max_dimension = max_dimension or self.max_dimension
         height, width = img.shape[:2]
 
-        if max(height, width) > self.max_dimension:
-            scale = self.max_dimension / max(height, width)
+        if max(height, width) > max_dimension:
+            scale = max_dimension / max(height, width)
             new_width = int(width * scale)
             new_height = int(height * scale)
 
+            # Halve with pyrDown while at least 2x too large; INTER_AREA then
+            # only has to average over small cells to hit the exact size
+            while img.shape[1] // 2 >= new_width and img.shape[0] // 2 >= new_height:
+                img = cv2.pyrDown(img)
+
             return cv2.resize(
                 img,
                 (new_width, new_height),
@@ -92,24 +623,20 @@ class ImageProcessor:
         """Convert numpy array to image bytes.
 
         Args:
-            img: Image array
+            img: Image array (BGR if color)
             format: Output format (PNG, JPEG)
 
         Returns:
             Image as bytes
         """
-        # Convert BGR to RGB if color image
-        if len(img.shape) == 3:
-            img_rgb = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
+        # cv2 encodes BGR directly, so no channel swap or PIL round-trip
+        if format.upper() == "PNG":
+            ext, params = ".png", [cv2.IMWRITE_PNG_COMPRESSION, 1]
         else:
-            img_rgb = img
-
-        # Convert to PIL Image
-        pil_img = Image.fromarray(img_rgb)
+            ext, params = ".jpg", [cv2.IMWRITE_JPEG_QUALITY, 90]
 
-        # Save to bytes
-        img_bytes = io.BytesIO()
-        pil_img.save(img_bytes, format=format)
-        img_bytes.seek(0)
+        ok, buffer = cv2.imencode(ext, img, params)
+        if not ok:
+            raise ValueError(f"Failed to encode image as {format}")
 
-        return img_bytes.getvalue()
+        return buffer.tobytes()
@@ -0,0 +1,118 @@
+"""Shared test fixtures."""
+
+import importlib.util
+import sys
+import types
+from typing import Any, Dict, Optional
+
+import cv2
+import numpy as np
+import pytest
+
+# Tests never run real OCR (engines are faked per test), so PaddleOCR is only
+# needed to import app modules; provide a placeholder when it is not installed
+if importlib.util.find_spec("paddleocr") is None:
+    sys.modules["paddleocr"] = types.SimpleNamespace(PaddleOCR=None)
+
+from app.config import Settings  # noqa: E402
+from app.core.schemas import ComplexityScore  # noqa: E402
+
+
+def make_poster(height: int = 2000, width: int = 1500, seed: int = 0) -> np.ndarray:
+    """Draw a synthetic grayscale event poster.
+
+    A title banner, rows of body text and a graphic, lightly blurred and with
+    sensor-like noise so it behaves like a phone photo rather than a
+    perfectly flat rendering.
+
+    Args:
+        height: Image height in pixels
+        width: Image width in pixels
+        seed: Noise seed
+
+    Returns:
+        Grayscale uint8 image
+    """
+    img = np.full((height, width), 235, np.uint8)
+    cv2.rectangle(img, (50, 50), (width - 50, height // 5), 90, -1)
+    cv2.putText(img, "SUMMER JAZZ NIGHT", (80, height // 7), cv2.FONT_HERSHEY_DUPLEX, width / 400, 255, 8)
+
+    y = height // 4
+    for i in range(30):
+        cv2.putText(
+            img,
+            f"Line {i} of event details, venue 123 Main St {i * 7}",
+            (80, y),
+            cv2.FONT_HERSHEY_SIMPLEX,
+            width / 1250,
+            20,
+            2
+        )
+        y += height // 45
+    cv2.circle(img, (width - width // 5, height - height // 7), min(height, width) // 8, 120, -1)
+
+    noisy = cv2.GaussianBlur(img.astype(np.float32), (0, 0), 1.0)
+    noisy += np.random.default_rng(seed).normal(0, 3, noisy.shape)
+    return np.clip(noisy, 0, 255).astype(np.uint8)
+
+
+def make_test_images() -> Dict[str, np.ndarray]:
+    """Color uint8 images that exercise the preprocessing edge cases.
+
+    Returns:
+        Images by name: a tinted poster, odd sizes that need CLAHE padding,
+        noise, flat and smooth areas, and images smaller than a tile
+    """
+    rng = np.random.default_rng(1)
+
+    def tinted_poster(height: int, width: int) -> np.ndarray:
+        bgr = cv2.cvtColor(make_poster(height, width), cv2.COLOR_GRAY2BGR).astype(np.int16)
+        bgr += np.array([12, -8, 20], np.int16)
+        return np.clip(bgr, 0, 255).astype(np.uint8)
+
+    gradient = np.tile(np.linspace(0, 255, 300), (200, 1)).astype(np.uint8)
+    return {
+        "poster": tinted_poster(800, 600),
+        "odd_size": tinted_poster(203, 317),
+        "one_side_divisible": tinted_poster(200, 301),
+        "noise": rng.integers(0, 256, (150, 170, 3), dtype=np.uint8),
+        "flat": np.full((120, 90, 3), 128, np.uint8),
+        "gradient": np.dstack([gradient, gradient[::-1], gradient]),
+        "tiny": rng.integers(0, 256, (5, 7, 3), dtype=np.uint8)
+    }
+
+
+class FakeOCR:
+    """OCR extractor returning fixed text."""
+
+    def extract(self, img: np.ndarray, lang: Optional[str] = None) -> Dict[str, Any]:
+        return {"text": "Jazz Night\n2026-03-15\nBlue Hall", "blocks": []}
+
+
+class FakePreprocessor:
+    """Preprocessor returning blank images."""
+
+    async def process_async(self, image_bytes: bytes):
+        return np.zeros((8, 8), np.uint8), np.zeros((8, 8, 3), np.uint8)
+
+
+class FixedScorer:
+    """Complexity scorer returning a fixed, sharp-image score."""
+
+    def __init__(self, overall_complexity: float):
+        self.score = ComplexityScore(
+            blur_variance=500.0,
+            edge_density=0.1,
+            text_density=0.6,
+            overall_complexity=overall_complexity,
+            is_blurry=False
+        )
+
+    def calculate(self, gray_img: np.ndarray) -> ComplexityScore:
+        return self.score
+
+
+@pytest.fixture
+def settings() -> Settings:
+    """Default settings, unaffected by any local .env file."""
+    return Settings(_env_file=None)
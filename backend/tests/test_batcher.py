@@ -0,0 +1,214 @@
+"""Tests for vision request micro-batching."""
+
+import asyncio
+
+from app import main
+from app.llm.base import LLMAdapter
+from app.llm.batcher import AsyncBatcher
+
+
+class RecordingAdapter(LLMAdapter):
+    """Records every vision call and echoes the image back as a field."""
+
+    provider = "fake"
+    model = "fake"
+
+    def __init__(self, delay=0.0, error=None, drop_last=False):
+        super().__init__()
+        self.delay = delay
+        self.error = error
+        self.drop_last = drop_last
+        self.calls = []
+
+    async def text_to_json(self, ocr_text, layout_blocks, timezone="UTC", on_field=None):
+        raise NotImplementedError
+
+    async def image_to_json(self, image_bytes, timezone="UTC", on_field=None):
+        return (await self.image_to_json_batch([image_bytes], timezone))[0]
+
+    async def image_to_json_batch(self, images, timezone="UTC"):
+        self.calls.append((list(images), timezone))
+        await asyncio.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        results = [{"fields": {"image": image.decode()}, "extra": []} for image in images]
+        return results[:-1] if self.drop_last else results
+
+
+def images(results):
+    return [result["fields"]["image"] for result in results]
+
+
+def test_flushes_when_batch_is_full():
+    async def run():
+        adapter = RecordingAdapter()
+        # A long interval, so only the size limit can trigger the flush
+        batcher = AsyncBatcher(flush_interval=60, max_batch=3)
+        results = await asyncio.wait_for(
+            asyncio.gather(*(batcher.submit(adapter, f"img{i}".encode()) for i in range(3))),
+            timeout=5
+        )
+        return adapter, results
+
+    adapter, results = asyncio.run(run())
+
+    assert images(results) == ["img0", "img1", "img2"]
+    assert adapter.calls == [([b"img0", b"img1", b"img2"], "UTC")]
+
+
+def test_flushes_after_interval():
+    async def run():
+        adapter = RecordingAdapter()
+        batcher = AsyncBatcher(flush_interval=0.05, max_batch=8)
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        results = await asyncio.gather(batcher.submit(adapter, b"a"), batcher.submit(adapter, b"b"))
+        return adapter, results, loop.time() - start
+
+    adapter, results, elapsed = asyncio.run(run())
+
+    assert images(results) == ["a", "b"]
+    assert adapter.calls == [([b"a", b"b"], "UTC")]
+    assert 0.05 <= elapsed < 1
+
+
+def test_groups_by_adapter_and_timezone():
+    async def run():
+        first, second = RecordingAdapter(), RecordingAdapter()
+        batcher = AsyncBatcher(flush_interval=0.01)
+        await asyncio.gather(
+            batcher.submit(first, b"a"),
+            batcher.submit(first, b"b", timezone="Europe/Paris"),
+            batcher.submit(second, b"c"),
+            batcher.submit(first, b"d")
+        )
+        return first, second
+
+    first, second = asyncio.run(run())
+
+    assert sorted(first.calls) == [([b"a", b"d"], "UTC"), ([b"b"], "Europe/Paris")]
+    assert second.calls == [([b"c"], "UTC")]
+
+
+def test_batch_error_reaches_every_waiter():
+    async def run():
+        batcher = AsyncBatcher(flush_interval=0.01)
+        adapter = RecordingAdapter(error=ConnectionError("quota exceeded"))
+        return await asyncio.gather(
+            *(batcher.submit(adapter, f"img{i}".encode()) for i in range(3)),
+            return_exceptions=True
+        )
+
+    results = asyncio.run(run())
+
+    assert len(results) == 3
+    assert all(isinstance(result, ConnectionError) for result in results)
+
+
+def test_short_result_list_fails_unmatched_waiters():
+    async def run():
+        batcher = AsyncBatcher(flush_interval=0.01)
+        adapter = RecordingAdapter(drop_last=True)
+        return await asyncio.wait_for(
+            asyncio.gather(batcher.submit(adapter, b"a"), batcher.submit(adapter, b"b"), return_exceptions=True),
+            timeout=5
+        )
+
+    first, second = asyncio.run(run())
+
+    assert images([first]) == ["a"]
+    assert isinstance(second, RuntimeError)
+
+
+def test_cancelled_waiter_is_dropped_before_flush():
+    async def run():
+        adapter = RecordingAdapter()
+        batcher = AsyncBatcher(flush_interval=0.05)
+        cancelled = asyncio.create_task(batcher.submit(adapter, b"a"))
+        kept = asyncio.create_task(batcher.submit(adapter, b"b"))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        result = await kept
+        return adapter, cancelled, result
+
+    adapter, cancelled, result = asyncio.run(run())
+
+    assert cancelled.cancelled()
+    assert images([result]) == ["b"]
+    assert adapter.calls == [([b"b"], "UTC")]
+
+
+def test_batch_is_not_sent_when_every_waiter_cancels():
+    async def run():
+        adapter = RecordingAdapter()
+        batcher = AsyncBatcher(flush_interval=0.01)
+        task = asyncio.create_task(batcher.submit(adapter, b"a"))
+        await asyncio.sleep(0)
+        task.cancel()
+        await asyncio.sleep(0.05)
+        return adapter, batcher
+
+    adapter, batcher = asyncio.run(run())
+
+    assert adapter.calls == []
+    assert not batcher._pending and not batcher._timers
+
+
+def test_cancelled_waiter_does_not_affect_inflight_batch():
+    async def run():
+        adapter = RecordingAdapter(delay=0.05)
+        batcher = AsyncBatcher(flush_interval=0.01)
+        cancelled = asyncio.create_task(batcher.submit(adapter, b"a"))
+        kept = asyncio.create_task(batcher.submit(adapter, b"b"))
+        await asyncio.sleep(0.03)  # Flushed, LLM call still running
+        cancelled.cancel()
+        return adapter, await kept
+
+    adapter, result = asyncio.run(run())
+
+    assert images([result]) == ["b"]
+    assert adapter.calls == [([b"a", b"b"], "UTC")]
+
+
+def test_close_flushes_pending_and_waits_for_inflight():
+    async def run():
+        adapter = RecordingAdapter(delay=0.05)
+        batcher = AsyncBatcher(flush_interval=60)
+        waiter = asyncio.create_task(batcher.submit(adapter, b"a"))
+        await asyncio.sleep(0)
+        await batcher.close()
+        return waiter
+
+    waiter = asyncio.run(run())
+
+    assert waiter.done()
+    assert images([waiter.result()]) == ["a"]
+
+
+def test_lifespan_shutdown_drains_batcher(monkeypatch):
+    monkeypatch.setattr(main.settings, "VISION_BATCH_ENABLED", True)
+    monkeypatch.setattr(main.settings, "VISION_BATCH_INTERVAL", 60)
+
+    async def run():
+        adapter = RecordingAdapter(delay=0.05)
+        async with main.lifespan(main.app):
+            batcher = main.app.state.batcher
+            assert isinstance(batcher, AsyncBatcher)
+            waiter = asyncio.create_task(batcher.submit(adapter, b"a"))
+            await asyncio.sleep(0)
+        return waiter
+
+    waiter = asyncio.run(run())
+
+    assert waiter.done()
+    assert images([waiter.result()]) == ["a"]
+
+
+def test_lifespan_without_batching(monkeypatch):
+    monkeypatch.setattr(main.settings, "VISION_BATCH_ENABLED", False)
+
+    async def run():
+        async with main.lifespan(main.app):
+            return main.app.state.batcher
+
+    assert asyncio.run(run()) is None
@@ -0,0 +1,76 @@
+"""Tests for complexity scoring and route decisions."""
+
+import cv2
+import pytest
+
+from app.preprocessing import complexity_scorer
+from app.preprocessing.complexity_scorer import ComplexityScorer, RouteDecider
+from tests.conftest import make_poster
+
+
+def test_blurred_poster_is_flagged_blurry(settings):
+    # A 4px blur hides the text from OCR; on a 512px thumbnail the same image
+    # has a Laplacian variance above BLUR_THRESHOLD and would look sharp
+    blurred = cv2.GaussianBlur(make_poster(), (0, 0), 4)
+
+    score = ComplexityScorer(settings.model_copy(update={"COMPLEXITY_MAX_DIM": 512})).calculate(blurred)
+
+    assert score.is_blurry
+    assert score.blur_variance < settings.BLUR_THRESHOLD
+    assert RouteDecider(settings).decide(score) == "vision"
+
+
+def test_sharp_poster_is_not_flagged_blurry(settings):
+    score = ComplexityScorer(settings).calculate(make_poster())
+
+    assert not score.is_blurry
+    assert score.blur_variance > settings.BLUR_THRESHOLD
+
+
+@pytest.mark.parametrize("sigma", [0, 2, 4, 8])
+def test_blur_variance_ignores_thumbnail_size(settings, sigma):
+    image = make_poster()
+    if sigma:
+        image = cv2.GaussianBlur(image, (0, 0), sigma)
+
+    thumbnail = ComplexityScorer(settings.model_copy(update={"COMPLEXITY_MAX_DIM": 512})).calculate(image)
+    full = ComplexityScorer(settings.model_copy(update={"COMPLEXITY_MAX_DIM": 10_000})).calculate(image)
+
+    assert thumbnail.blur_variance == pytest.approx(full.blur_variance)
+    assert thumbnail.is_blurry == full.is_blurry
+
+
+@pytest.mark.parametrize(
+    "height, width, sigma",
+    [(2000, 1500, 0), (1500, 2000, 0), (1200, 900, 0), (2000, 1500, 4)]
+)
+def test_default_scores_match_full_resolution(settings, height, width, sigma):
+    # Routing thresholds are calibrated at full resolution, so the default
+    # scorer must reproduce full-resolution scores exactly
+    image = make_poster(height, width)
+    if sigma:
+        image = cv2.GaussianBlur(image, (0, 0), sigma)
+
+    default = ComplexityScorer(settings).calculate(image)
+    full = ComplexityScorer(settings.model_copy(update={"COMPLEXITY_MAX_DIM": 10_000})).calculate(image)
+
+    assert default.is_blurry == full.is_blurry
+    assert default.overall_complexity == pytest.approx(full.overall_complexity)
+    assert RouteDecider(settings).decide(default) == RouteDecider(settings).decide(full)
+
+
+def test_scorers_share_one_pool(settings, monkeypatch):
+    monkeypatch.setattr(complexity_scorer, "_executor", None)
+    image = make_poster(400, 300)
+
+    ComplexityScorer(settings).calculate(image)
+    executor = complexity_scorer._executor
+    ComplexityScorer(settings).calculate(image)
+
+    assert executor is not None and complexity_scorer._executor is executor
+    complexity_scorer.shutdown_scoring_pool()
+    assert complexity_scorer._executor is None
+    assert executor._shutdown
+    # A later score starts a fresh pool
+    ComplexityScorer(settings).calculate(image)
+    assert complexity_scorer._executor is not None
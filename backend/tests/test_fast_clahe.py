@@ -0,0 +1,35 @@
+"""Tests for the Numba CLAHE against cv2.CLAHE."""
+
+import cv2
+import numpy as np
+import pytest
+
+from app.preprocessing.fast_clahe import clahe_u8, tile_size
+from tests.conftest import make_test_images
+
+IMAGES = make_test_images()
+
+
+@pytest.mark.parametrize("name", IMAGES)
+@pytest.mark.parametrize("clip_limit, tile_grid", [(2.0, (8, 8)), (4.0, (4, 6)), (0.0, (8, 8))])
+def test_matches_opencv(name, clip_limit, tile_grid):
+    gray = cv2.cvtColor(IMAGES[name], cv2.COLOR_BGR2GRAY)
+
+    expected = cv2.createCLAHE(clip_limit, tile_grid).apply(gray)
+    actual = clahe_u8(gray, clip_limit, tile_grid)
+
+    # OpenCV interpolates in float32, so a few values round the other way
+    diff = np.abs(actual.astype(np.int16) - expected)
+    assert diff.max() <= 1
+    assert np.count_nonzero(diff) <= 0.01 * diff.size
+
+
+@pytest.mark.parametrize("height, width, expected", [
+    (800, 600, (100, 75)),
+    (203, 317, (26, 40)),
+    # OpenCV pads the divisible side too when the other one needs it
+    (200, 301, (26, 38)),
+    (120, 90, (16, 12))
+])
+def test_tile_size_matches_opencv_padding(height, width, expected):
+    assert tile_size(height, width, (8, 8)) == expected
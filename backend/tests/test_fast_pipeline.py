@@ -0,0 +1,135 @@
+"""Tests for the fused Numba preprocessing kernel against the OpenCV path."""
+
+import cv2
+import numpy as np
+import pytest
+
+from app.preprocessing.fast_pipeline import BLOCK_SIZE, bilateral_tables, fused_preprocess
+from app.preprocessing.image_processor import (
+    BILATERAL_DIAMETER,
+    BILATERAL_SIGMA_COLOR,
+    BILATERAL_SIGMA_SPACE,
+    ImageProcessor,
+)
+from tests.conftest import make_test_images
+
+IMAGES = make_test_images()
+TABLES = bilateral_tables(BILATERAL_DIAMETER, BILATERAL_SIGMA_COLOR, BILATERAL_SIGMA_SPACE)
+
+
+def opencv_preprocess(bgr, clip_limit, tile_grid):
+    gray = cv2.cvtColor(bgr, cv2.COLOR_BGR2GRAY)
+    enhanced = cv2.createCLAHE(clip_limit, tile_grid).apply(gray)
+    return cv2.bilateralFilter(enhanced, BILATERAL_DIAMETER, BILATERAL_SIGMA_COLOR, BILATERAL_SIGMA_SPACE)
+
+
+def assert_close(actual, expected):
+    # Fixed-point weights and OpenCV's float32 CLAHE interpolation round a
+    # few pixels the other way
+    diff = np.abs(actual.astype(np.int16) - expected)
+    assert diff.max() <= 1
+    assert np.count_nonzero(diff) <= 0.01 * diff.size
+
+
+@pytest.mark.parametrize("name", IMAGES)
+@pytest.mark.parametrize("clip_limit, tile_grid", [(2.0, (8, 8)), (4.0, (4, 6))])
+def test_matches_opencv_path(name, clip_limit, tile_grid):
+    bgr = IMAGES[name]
+
+    actual = fused_preprocess(bgr, clip_limit, tile_grid, TABLES)
+
+    assert actual.shape == bgr.shape[:2]
+    assert actual.dtype == np.uint8
+    assert_close(actual, opencv_preprocess(bgr, clip_limit, tile_grid))
+
+
+def test_non_contiguous_input():
+    bgr = IMAGES["poster"][::2, ::2]
+
+    assert_close(fused_preprocess(bgr, 2.0, (8, 8), TABLES), opencv_preprocess(bgr, 2.0, (8, 8)))
+
+
+def reference_bilateral(gray, diameter, sigma_color, sigma_space):
+    """Bilateral filter computed from its definition in float64."""
+    radius = diameter // 2
+    padded = cv2.copyMakeBorder(gray, radius, radius, radius, radius, cv2.BORDER_REFLECT_101).astype(np.float64)
+    total = np.zeros(gray.shape)
+    weight_sum = np.zeros(gray.shape)
+    for dy in range(-radius, radius + 1):
+        for dx in range(-radius, radius + 1):
+            if dy * dy + dx * dx > radius * radius:
+                continue
+            value = padded[radius + dy:radius + dy + gray.shape[0], radius + dx:radius + dx + gray.shape[1]]
+            weight = (
+                np.exp(-0.5 * (dy * dy + dx * dx) / sigma_space ** 2)
+                * np.exp(-0.5 * ((value - gray) / sigma_color) ** 2)
+            )
+            total += weight * value
+            weight_sum += weight
+    return np.rint(total / weight_sum)
+
+
+@pytest.mark.parametrize("diameter, sigma_color, sigma_space", [(5, 30.0, 10.0), (9, 75.0, 75.0), (15, 100.0, 50.0)])
+def test_other_bilateral_parameters(diameter, sigma_color, sigma_space):
+    # Compared with the definition: cv2.bilateralFilter truncates instead of
+    # rounding for some window sizes
+    bgr = IMAGES["odd_size"]
+    gray = cv2.createCLAHE(2.0, (8, 8)).apply(cv2.cvtColor(bgr, cv2.COLOR_BGR2GRAY))
+
+    actual = fused_preprocess(bgr, 2.0, (8, 8), bilateral_tables(diameter, sigma_color, sigma_space))
+
+    assert_close(actual, reference_bilateral(gray, diameter, sigma_color, sigma_space))
+
+
+def test_uniform_windows_keep_their_value():
+    bgr = np.full((100, 140, 3), 90, np.uint8)
+
+    actual = fused_preprocess(bgr, 2.0, (8, 8), TABLES)
+
+    np.testing.assert_array_equal(actual, opencv_preprocess(bgr, 2.0, (8, 8)))
+    assert len(np.unique(actual)) == 1
+
+
+@pytest.mark.parametrize("y, x", [
+    (50, 50),
+    # Just inside and outside a block edge, so the dot is only in the halo
+    (BLOCK_SIZE - 1, BLOCK_SIZE),
+    (BLOCK_SIZE + TABLES.radius, BLOCK_SIZE - TABLES.radius - 1),
+    # Image borders, where the window is reflected
+    (0, 0),
+    (127, 159),
+    (1, 158)
+])
+def test_uniform_shortcut_is_not_taken_near_detail(y, x):
+    # A single dot on a flat background: every window that contains it must
+    # be filtered, and every other window is uniform
+    bgr = np.full((128, 160, 3), 60, np.uint8)
+    bgr[y, x] = 200
+
+    actual = fused_preprocess(bgr, 2.0, (8, 8), TABLES)
+    expected = opencv_preprocess(bgr, 2.0, (8, 8))
+
+    assert_close(actual, expected)
+    background = expected[64, 20]
+    np.testing.assert_array_equal(actual == background, expected == background)
+
+
+@pytest.mark.parametrize("column", [10, BLOCK_SIZE - 1, BLOCK_SIZE, 150])
+def test_uniform_shortcut_with_vertical_edge(column):
+    # Rows are uniform up to the edge; windows that reach it must not be skipped
+    bgr = np.full((96, 160, 3), 40, np.uint8)
+    bgr[:, column:] = 180
+
+    actual = fused_preprocess(bgr, 2.0, (8, 8), TABLES)
+
+    assert_close(actual, opencv_preprocess(bgr, 2.0, (8, 8)))
+
+
+def test_numba_backend_matches_opencv_backend(settings):
+    bgr = IMAGES["poster"]
+    image_bytes = cv2.imencode(".png", bgr)[1].tobytes()
+
+    numba, _ = ImageProcessor(settings.model_copy(update={"PREPROCESS_BACKEND": "numba"})).process(image_bytes)
+    opencv, _ = ImageProcessor(settings.model_copy(update={"PREPROCESS_BACKEND": "opencv"})).process(image_bytes)
+
+    assert_close(numba, opencv)
@@ -0,0 +1,13 @@
+"""Tests for the Gemini adapter."""
+
+import httpx
+
+from app.llm.gemini_adapter import GeminiAdapter
+
+
+def test_adapter_uses_shared_http_client():
+    client = httpx.AsyncClient()
+
+    adapter = GeminiAdapter(api_key="test-key", http_client=client)
+
+    assert adapter.client._api_client._async_httpx_client is client
@@ -0,0 +1,69 @@
+"""Tests for image preprocessing sizes and shared resources."""
+
+import asyncio
+
+import cv2
+import pytest
+
+from app.preprocessing import image_processor
+from app.preprocessing.image_processor import ImageProcessor
+from tests.conftest import make_poster
+
+
+def encode(height, width):
+    return cv2.imencode(".png", cv2.cvtColor(make_poster(height, width), cv2.COLOR_GRAY2BGR))[1].tobytes()
+
+
+@pytest.mark.parametrize("backend", ["opencv", "numba"])
+def test_default_ocr_image_keeps_preprocess_size(settings, backend):
+    processor = ImageProcessor(settings.model_copy(update={"PREPROCESS_BACKEND": backend}))
+
+    processed, original = processor.process(encode(2000, 1500))
+
+    assert processed.shape == original.shape[:2] == (2000, 1500)
+
+
+def test_large_upload_is_limited_to_preprocess_max_dim(settings):
+    processed, original = ImageProcessor(settings).process(encode(3000, 2250))
+
+    assert original.shape[:2] == (2000, 1500)
+    assert processed.shape == (2000, 1500)
+
+
+def test_smaller_ocr_image_is_opt_in(settings):
+    processor = ImageProcessor(settings.model_copy(update={"OCR_MAX_DIM": 1600}))
+
+    processed, original = processor.process(encode(2000, 1500))
+
+    assert original.shape[:2] == (2000, 1500)
+    assert processed.shape == (1600, 1200)
+
+
+def test_processors_share_one_pool(settings, monkeypatch):
+    monkeypatch.setattr(image_processor, "_pool", None)
+    first, second = ImageProcessor(settings), ImageProcessor(settings)
+    image_bytes = encode(200, 150)
+
+    async def run():
+        await first.process_async(image_bytes)
+        pool = image_processor._pool
+        await second.process_async(image_bytes)
+        return pool
+
+    pool = asyncio.run(run())
+
+    assert pool is not None and image_processor._pool is pool
+    image_processor.shutdown_preprocess_pool()
+    assert image_processor._pool is None
+    assert pool._shutdown
+
+
+def test_opencv_globals_are_set_once(settings, monkeypatch):
+    calls = []
+    monkeypatch.setattr(image_processor, "_opencv_threads", None)
+    monkeypatch.setattr(image_processor.cv2, "setNumThreads", calls.append)
+
+    ImageProcessor(settings)
+    ImageProcessor(settings.model_copy(update={"OCV_THREADS": 3}))
+
+    assert calls == [settings.OCV_THREADS]
@@ -0,0 +1,158 @@
+"""Tests for the SQLite extraction result cache."""
+
+import asyncio
+
+import pytest
+
+from app.core import llm_cache, pipeline as pipeline_module
+from app.core.llm_cache import LLMResultCache
+from app.core.pipeline import ExtractionPipeline
+from app.llm.base import LLMAdapter
+from tests.conftest import FakeOCR, FakePreprocessor, FixedScorer
+
+KEY = ("gemini", "model", "v1", "abc", "en", "UTC", "ocr_first")
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return LLMResultCache(str(tmp_path))
+
+
+def test_hit_returns_stored_value(cache):
+    cache.set(KEY, {"fields": {"a": 1}})
+
+    assert cache.get(KEY) == {"fields": {"a": 1}}
+
+
+def test_miss_on_unknown_key(cache):
+    cache.set(KEY, {"fields": {}})
+
+    assert cache.get(KEY[:-1] + ("vision",)) is None
+
+
+def test_entry_expires_after_ttl(cache, monkeypatch):
+    now = 1_000_000.0
+    monkeypatch.setattr(llm_cache.time, "time", lambda: now)
+    cache.set(KEY, {"fields": {}}, ttl=60)
+
+    now += 59
+    assert cache.get(KEY) == {"fields": {}}
+
+    now += 2
+    assert cache.get(KEY) is None
+
+
+def test_delete_evicts_entry(cache):
+    cache.set(KEY, {"fields": {}})
+    cache.delete(KEY)
+
+    assert cache.get(KEY) is None
+
+
+def test_entries_persist_across_instances(tmp_path):
+    LLMResultCache(str(tmp_path)).set(KEY, {"fields": {}})
+
+    assert LLMResultCache(str(tmp_path)).get(KEY) == {"fields": {}}
+
+
+class CountingAdapter(LLMAdapter):
+    """Counts LLM calls and returns a complete extraction."""
+
+    provider = "fake"
+    model = "fake"
+
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+
+    async def text_to_json(self, ocr_text, layout_blocks, timezone="UTC", on_field=None):
+        self.calls += 1
+        return {
+            "fields": {
+                "event_name": {"value": "Jazz Night", "confidence": 0.95, "source": "line 1"},
+                "date": {"value": "2026-03-15", "confidence": 0.9, "source": "line 2"},
+                "venue_name": {"value": "Blue Hall", "confidence": 0.8, "source": "line 3"}
+            },
+            "extra": []
+        }
+
+    async def image_to_json(self, image_bytes, timezone="UTC", on_field=None):
+        return await self.text_to_json("", [], timezone, on_field)
+
+
+@pytest.fixture
+def cached_pipeline(settings, tmp_path):
+    adapter = CountingAdapter()
+    pipeline = ExtractionPipeline(
+        llm_adapter=adapter,
+        ocr_extractor=FakeOCR(),
+        config=settings.model_copy(update={"LLM_CACHE_ENABLED": True, "CACHE_DIR": str(tmp_path)}),
+        preprocessor=FakePreprocessor(),
+        complexity_scorer=FixedScorer(0.3)
+    )
+    return pipeline, adapter
+
+
+def test_pipeline_reuses_cached_result(cached_pipeline):
+    pipeline, adapter = cached_pipeline
+    params = {"lang": "en", "timezone": "UTC"}
+
+    first = asyncio.run(pipeline.process(b"image", params))
+    second = asyncio.run(pipeline.process(b"image", params))
+
+    assert adapter.calls == 1
+    assert second == first
+
+
+@pytest.mark.parametrize("change", [
+    {"image": b"other image"},
+    {"lang": "fr"},
+    {"timezone": "Europe/Paris"},
+    {"force_route": "vision"},
+    {"prompt_version": "v2"}
+])
+def test_pipeline_cache_key_changes(cached_pipeline, monkeypatch, change):
+    pipeline, adapter = cached_pipeline
+    params = {"lang": "en", "timezone": "UTC"}
+    asyncio.run(pipeline.process(b"image", params))
+
+    if "prompt_version" in change:
+        monkeypatch.setattr(pipeline_module, "PROMPT_VERSION", change.pop("prompt_version"))
+    image = change.pop("image", b"image")
+    asyncio.run(pipeline.process(image, {**params, **change}))
+
+    assert adapter.calls == 2
+
+
+def test_pipeline_cache_is_scoped_to_api_key(settings, tmp_path):
+    config = settings.model_copy(update={"LLM_CACHE_ENABLED": True, "CACHE_DIR": str(tmp_path)})
+    owner, other = CountingAdapter(), CountingAdapter()
+    owner.key_hash = CountingAdapter._hash_key("owner-key")
+    other.key_hash = CountingAdapter._hash_key("other-key")
+
+    for adapter in (owner, other):
+        pipeline = ExtractionPipeline(
+            llm_adapter=adapter,
+            ocr_extractor=FakeOCR(),
+            config=config,
+            preprocessor=FakePreprocessor(),
+            complexity_scorer=FixedScorer(0.3)
+        )
+        asyncio.run(pipeline.process(b"image", {"lang": "en", "timezone": "UTC"}))
+
+    assert owner.calls == other.calls == 1
+
+
+def test_pipeline_without_cache_writes_nothing(settings, tmp_path):
+    pipeline = ExtractionPipeline(
+        llm_adapter=CountingAdapter(),
+        ocr_extractor=FakeOCR(),
+        config=settings.model_copy(update={"CACHE_DIR": str(tmp_path / "cache")}),
+        preprocessor=FakePreprocessor(),
+        complexity_scorer=FixedScorer(0.3)
+    )
+
+    asyncio.run(pipeline.process(b"image", {"lang": "en"}))
+
+    assert pipeline.result_cache is None
+    assert not (tmp_path / "cache").exists()
@@ -0,0 +1,42 @@
+"""Tests for LLM adapter creation and reuse."""
+
+import asyncio
+
+import httpx
+import pytest
+
+from app import main
+from app.llm import factory
+from app.llm.factory import clear_adapter_cache, create_llm_adapter
+
+
+@pytest.fixture(autouse=True)
+def empty_adapter_cache():
+    clear_adapter_cache()
+    yield
+    clear_adapter_cache()
+
+
+def test_adapter_is_reused_for_the_same_client():
+    client = httpx.AsyncClient()
+
+    first = create_llm_adapter("mock", http_client=client)
+
+    assert create_llm_adapter("mock", http_client=client) is first
+    assert create_llm_adapter("mock", http_client=httpx.AsyncClient()) is not first
+
+
+def test_lifespan_shutdown_clears_adapters(monkeypatch):
+    monkeypatch.setattr(main.settings, "LLM_PROVIDER", "mock")
+
+    async def run():
+        async with main.lifespan(main.app):
+            return main.app.state.http, main.app.state.llm_adapter
+
+    first_client, first_adapter = asyncio.run(run())
+    assert not factory._adapter_cache
+
+    second_client, second_adapter = asyncio.run(run())
+
+    assert second_adapter is not first_adapter
+    assert second_adapter.http_client is second_client
@@ -0,0 +1,191 @@
+"""Tests for the LLM adapter response cache."""
+
+import asyncio
+import json
+import types
+
+import pytest
+
+from app.llm import cache as cache_module
+from app.llm.cache import LLMCache
+from app.llm.gemini_adapter import GeminiAdapter
+
+
+class FakeRedis:
+    """Subset of redis.asyncio.Redis used by LLMCache, with a settable clock."""
+
+    def __init__(self, url):
+        self.url = url
+        self.now = 0.0
+        self.entries = {}
+        self.fail = False
+        self.closed = False
+
+    async def get(self, key):
+        if self.fail:
+            raise ConnectionError("redis down")
+        entry = self.entries.get(key)
+        if entry is None or entry[0] <= self.now:
+            return None
+        return entry[1].encode()
+
+    async def set(self, key, value, ex=None):
+        if self.fail:
+            raise ConnectionError("redis down")
+        self.entries[key] = (self.now + ex, value)
+
+    async def aclose(self):
+        self.closed = True
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    monkeypatch.setattr(cache_module, "redis", types.SimpleNamespace(from_url=FakeRedis))
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache_module.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_memory_hit_and_miss():
+    async def run():
+        cache = LLMCache()
+        await cache.set("a", {"fields": {"x": 1}})
+        return await cache.get("a"), await cache.get("b")
+
+    assert asyncio.run(run()) == ({"fields": {"x": 1}}, None)
+
+
+def test_memory_hit_is_a_copy():
+    async def run():
+        cache = LLMCache()
+        await cache.set("a", {"fields": {}})
+        (await cache.get("a"))["fields"]["x"] = 1
+        return await cache.get("a")
+
+    assert asyncio.run(run()) == {"fields": {}}
+
+
+def test_memory_entry_expires(clock):
+    async def run():
+        cache = LLMCache(ttl=60)
+        await cache.set("a", {"v": 1})
+        await cache.set("b", {"v": 2}, ttl=120)
+        clock[0] += 61
+        return await cache.get("a"), await cache.get("b")
+
+    assert asyncio.run(run()) == (None, {"v": 2})
+
+
+def test_memory_evicts_least_recently_used():
+    async def run():
+        cache = LLMCache(max_entries=2)
+        await cache.set("a", {"v": 1})
+        await cache.set("b", {"v": 2})
+        await cache.get("a")
+        await cache.set("c", {"v": 3})
+        return [await cache.get(key) for key in "abc"]
+
+    assert asyncio.run(run()) == [{"v": 1}, None, {"v": 3}]
+
+
+def test_redis_backend_stores_with_prefix_and_ttl(fake_redis):
+    async def run():
+        cache = LLMCache(ttl=60, redis_url="redis://cache:6379/0")
+        await cache.set("a", {"v": 1})
+        hit = await cache.get("a")
+        cache._redis.now += 61
+        expired = await cache.get("a")
+        await cache.close()
+        return cache._redis, hit, expired
+
+    client, hit, expired = asyncio.run(run())
+
+    assert client.url == "redis://cache:6379/0"
+    assert list(client.entries) == ["llm:a"]
+    assert hit == {"v": 1}
+    assert expired is None
+    assert client.closed
+
+
+def test_redis_errors_behave_as_misses(fake_redis):
+    async def run():
+        cache = LLMCache(redis_url="redis://cache:6379/0")
+        cache._redis.fail = True
+        await cache.set("a", {"v": 1})
+        return await cache.get("a")
+
+    assert asyncio.run(run()) is None
+
+
+def test_redis_url_without_redis_uses_memory(monkeypatch):
+    monkeypatch.setattr(cache_module, "redis", None)
+
+    async def run():
+        cache = LLMCache(redis_url="redis://cache:6379/0")
+        await cache.set("a", {"v": 1})
+        return cache, await cache.get("a")
+
+    cache, hit = asyncio.run(run())
+
+    assert cache._redis is None
+    assert hit == {"v": 1}
+
+
+def test_gemini_reuses_response_for_same_ocr_text(monkeypatch):
+    # Different uploads (re-encoded, resized) that OCR to the same text miss
+    # the pipeline's result cache but share one LLM response here
+    adapter = GeminiAdapter(api_key="test-key", cache=LLMCache())
+    calls = []
+
+    async def generate(contents, config, on_field=None):
+        calls.append(contents)
+        return json.dumps({"fields": {"event_name": {"value": "Jazz Night", "confidence": 0.9}}, "extra": []})
+
+    monkeypatch.setattr(adapter, "_generate_text", generate)
+
+    async def run():
+        first = await adapter.text_to_json("JAZZ NIGHT", [], timezone="UTC")
+        second = await adapter.text_to_json("JAZZ NIGHT", [], timezone="UTC")
+        await adapter.text_to_json("JAZZ NIGHT", [], timezone="Europe/Paris")
+        await adapter.text_to_json("BLUES NIGHT", [], timezone="UTC")
+        return first, second
+
+    first, second = asyncio.run(run())
+
+    assert second == first
+    assert len(calls) == 3
+
+
+def test_gemini_never_shares_responses_across_api_keys(monkeypatch):
+    cache = LLMCache()
+    owner = GeminiAdapter(api_key="owner-key", cache=cache)
+    other = GeminiAdapter(api_key="other-key", cache=cache)
+    calls = []
+
+    async def owner_generate(contents, config, on_field=None):
+        calls.append("owner")
+        return json.dumps({"fields": {"event_name": {"value": "Jazz Night", "confidence": 0.9}}, "extra": []})
+
+    async def rejected(contents, config, on_field=None):
+        calls.append("other")
+        raise PermissionError("API key not valid")
+
+    monkeypatch.setattr(owner, "_generate_text", owner_generate)
+    monkeypatch.setattr(other, "_generate_text", rejected)
+
+    async def run():
+        await owner.text_to_json("JAZZ NIGHT", [], timezone="UTC")
+        return await other.text_to_json("JAZZ NIGHT", [], timezone="UTC")
+
+    result = asyncio.run(run())
+
+    assert calls == ["owner", "other"]
+    assert result["fields"] == {}
+    assert "API key not valid" in result["error"]
+    assert owner._text_cache_key("JAZZ NIGHT", "UTC") != other._text_cache_key("JAZZ NIGHT", "UTC")
+    assert owner._image_cache_key(b"image", "UTC") != other._image_cache_key(b"image", "UTC")
+    assert "owner-key" not in owner._text_cache_key("JAZZ NIGHT", "UTC")
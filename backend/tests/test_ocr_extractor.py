@@ -0,0 +1,78 @@
+"""Tests for OCR engine sharing and language validation."""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from app.extractors import ocr_extractor
+from app.extractors.ocr_extractor import OCRExtractor
+from app.main import app
+
+
+class SlowPaddleOCR:
+    """Stands in for PaddleOCR; model loading takes a while."""
+
+    created = []
+    lock = threading.Lock()
+
+    def __init__(self, lang, **kwargs):
+        time.sleep(0.05)
+        with self.lock:
+            self.created.append(lang)
+        self.lang = lang
+
+    def ocr(self, img, cls=True):
+        return [[]]
+
+
+@pytest.fixture(autouse=True)
+def fake_paddle(monkeypatch):
+    monkeypatch.setattr(ocr_extractor, "PaddleOCR", SlowPaddleOCR)
+    monkeypatch.setattr(ocr_extractor, "_engines", {})
+    SlowPaddleOCR.created = []
+
+
+def test_concurrent_first_use_loads_one_engine(settings):
+    extractor = OCRExtractor(settings)
+    img = np.zeros((8, 8), np.uint8)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(lambda lang: extractor.extract(img, lang), ["en"] * 8 + ["fr"] * 8))
+
+    assert sorted(SlowPaddleOCR.created) == ["en", "fr"]
+    assert all(result["text"] == "" for result in results)
+
+
+def test_engine_is_reused(settings):
+    assert ocr_extractor._get_paddle("en") is ocr_extractor._get_paddle("en")
+    assert SlowPaddleOCR.created == ["en"]
+
+
+def test_default_language_is_used(settings):
+    OCRExtractor(settings).extract(np.zeros((8, 8), np.uint8))
+
+    assert SlowPaddleOCR.created == [settings.OCR_DEFAULT_LANG]
+
+
+@pytest.mark.parametrize("lang", ["xx", "EN", "../en", "en " * 1000])
+def test_unsupported_language_is_rejected_before_loading(settings, lang):
+    with pytest.raises(ValueError, match="Unsupported OCR language"):
+        OCRExtractor(settings).extract(np.zeros((8, 8), np.uint8), lang)
+
+    assert SlowPaddleOCR.created == []
+    assert ocr_extractor._engines == {}
+
+
+def test_endpoint_rejects_unsupported_language():
+    response = TestClient(app).post(
+        "/api/v1/extract",
+        files={"file": ("poster.png", b"image", "image/png")},
+        data={"lang": "xx", "provider": "mock"}
+    )
+
+    assert response.status_code == 400
+    assert "Unsupported OCR language" in response.json()["detail"]
@@ -0,0 +1,80 @@
+"""Tests for ExtractionPipeline routing."""
+
+import asyncio
+
+from app.core.pipeline import ExtractionPipeline
+from app.llm.base import LLMAdapter
+from tests.conftest import FakeOCR, FakePreprocessor, FixedScorer
+
+SUFFICIENT_FIELDS = {
+    "event_name": {"value": "Jazz Night", "confidence": 0.95, "source": "line 1"},
+    "date": {"value": "2026-03-15", "confidence": 0.9, "source": "line 2"},
+    "venue_name": {"value": "Blue Hall", "confidence": 0.8, "source": "line 3"},
+}
+
+
+class FakeAdapter(LLMAdapter):
+    """Answers text requests at once; vision requests hang until cancelled."""
+
+    provider = "fake"
+    model = "fake"
+
+    def __init__(self):
+        super().__init__()
+        self.vision_started = asyncio.Event()
+        self.vision_cancelled = False
+
+    async def text_to_json(self, ocr_text, layout_blocks, timezone="UTC", on_field=None):
+        return {"fields": dict(SUFFICIENT_FIELDS), "extra": []}
+
+    async def image_to_json(self, image_bytes, timezone="UTC", on_field=None):
+        self.vision_started.set()
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            self.vision_cancelled = True
+            raise
+        return {"fields": {}, "extra": []}
+
+
+def make_pipeline(settings, adapter: LLMAdapter, overall_complexity: float) -> ExtractionPipeline:
+    return ExtractionPipeline(
+        llm_adapter=adapter,
+        ocr_extractor=FakeOCR(),
+        config=settings,
+        preprocessor=FakePreprocessor(),
+        complexity_scorer=FixedScorer(overall_complexity)
+    )
+
+
+def test_sufficient_ocr_wins_speculative_race(settings):
+    async def run():
+        adapter = FakeAdapter()
+        # Inside COMPLEXITY_SPEC_BAND, so OCR and vision race
+        pipeline = make_pipeline(settings, adapter, overall_complexity=0.6)
+
+        result = await pipeline.process(b"image", {"lang": "en", "timezone": "UTC"})
+        await asyncio.sleep(0)
+        return adapter, result
+
+    adapter, result = asyncio.run(run())
+
+    assert result["route"] == "ocr_first"
+    assert result["fields"]["event_name"]["value"] == "Jazz Night"
+    assert adapter.vision_started.is_set()
+    assert adapter.vision_cancelled
+
+
+def test_sufficient_ocr_first_route_skips_vision(settings):
+    async def run():
+        adapter = FakeAdapter()
+        # Text-heavy and below the speculative band: plain OCR-first route
+        pipeline = make_pipeline(settings, adapter, overall_complexity=0.3)
+
+        result = await pipeline.process(b"image", {"lang": "en", "timezone": "UTC"})
+        return adapter, result
+
+    adapter, result = asyncio.run(run())
+
+    assert result["route"] == "ocr_first"
+    assert not adapter.vision_started.is_set()
@@ -0,0 +1,194 @@
+"""Tests for incremental field parsing and the /extract/stream endpoint."""
+
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api.v1.endpoints import extract
+from app.llm.base import LLMAdapter
+from app.llm.streaming import FieldStreamParser
+from app.main import app
+from tests.conftest import FakeOCR, FakePreprocessor, FixedScorer
+
+RESPONSE = json.dumps({
+    "fields": {
+        "event_name": {"value": "Say \"hi\" \\ {not a brace}", "confidence": 0.9, "source": "line 1"},
+        "price": 12.5,
+        "free": False,
+        "organizer": None,
+        "performers": [{"name": "A", "roles": ["sax", "voice"]}, {"name": "Bé"}],
+        "venue": {"address": {"street": "1 Main St", "city": "Springfield"}, "confidence": 0.8}
+    },
+    "extra": [{"key": "age", "value": "21+"}]
+}, ensure_ascii=False)
+
+
+def feed_in_chunks(text, size):
+    parser = FieldStreamParser()
+    completed = []
+    for i in range(0, len(text), size):
+        completed.extend(parser.feed(text[i:i + size]))
+    return completed
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 64, len(RESPONSE)])
+def test_chunking_yields_each_field_once(size):
+    assert feed_in_chunks(RESPONSE, size) == list(json.loads(RESPONSE)["fields"].items())
+
+
+def test_field_split_inside_escape_waits_for_string_end():
+    parser = FieldStreamParser()
+
+    assert parser.feed('{"fields": {"name": {"value": "a \\') == []
+    assert parser.feed('"quoted\\" }') == []
+    assert parser.feed('"}, ') == [("name", {"value": 'a "quoted" }'})]
+
+
+def test_number_waits_for_delimiter():
+    parser = FieldStreamParser()
+
+    assert parser.feed('{"fields": {"price": 12') == []
+    assert parser.feed('3') == []
+    assert parser.feed('}') == [("price", 123)]
+
+
+def test_fields_after_object_end_are_ignored():
+    parser = FieldStreamParser()
+
+    assert parser.feed('{"fields": {"a": 1}, "extra": [{"b": 2}], "c": {"d": 3}}') == [("a", 1)]
+    assert parser.feed('{"fields": {"e": 4}}') == []
+
+
+def test_markdown_fence_before_json():
+    assert feed_in_chunks('```json\n{"fields": {"a": "x"}}\n```', 4) == [("a", "x")]
+
+
+def test_truncated_stream_returns_complete_fields_only():
+    truncated = RESPONSE[:RESPONSE.index('"performers"') + 30]
+
+    assert [name for name, _ in feed_in_chunks(truncated, 5)] == ["event_name", "price", "free", "organizer"]
+
+
+@pytest.mark.parametrize("text", [
+    "",
+    "not json at all",
+    '{"extra": []}',
+    '{"fields": {"a": 1, oops: 2, "b": 3}}',
+    '{"fields": {"a": 1, "b" 2}}',
+    '{"fields": ["a", 1]}'
+])
+def test_invalid_stream_does_not_raise(text):
+    completed = feed_in_chunks(text, 3)
+
+    assert completed in ([], [("a", 1)])
+
+
+class StreamingAdapter(LLMAdapter):
+    """Emits each field through on_field before returning the result."""
+
+    provider = "mock"
+    model = "mock"
+
+    def __init__(self, fields=None, error=None):
+        super().__init__()
+        self.fields = fields or {}
+        self.error = error
+
+    async def text_to_json(self, ocr_text, layout_blocks, timezone="UTC", on_field=None):
+        result = {"fields": self.fields, "extra": []}
+        await self._emit_fields(result, on_field)
+        if self.error is not None:
+            raise self.error
+        return result
+
+    async def image_to_json(self, image_bytes, timezone="UTC", on_field=None):
+        return await self.text_to_json("", [], timezone, on_field)
+
+
+def parse_sse(body):
+    events = []
+    for block in body.strip().split("\n\n"):
+        event, data = block.split("\n")
+        assert event.startswith("event: ") and data.startswith("data: ")
+        events.append((event[len("event: "):], json.loads(data[len("data: "):])))
+    return events
+
+
+@pytest.fixture
+def stream_client(monkeypatch):
+    def client(adapter):
+        monkeypatch.setattr(extract, "ocr_extractor", FakeOCR())
+        monkeypatch.setattr(extract, "preprocessor", FakePreprocessor())
+        monkeypatch.setattr(extract, "complexity_scorer", FixedScorer(0.3))
+        app.dependency_overrides[extract.get_default_adapter] = lambda: adapter
+        return TestClient(app)
+
+    yield client
+    app.dependency_overrides.clear()
+
+
+def post_stream(client):
+    return client.post(
+        "/api/v1/extract/stream",
+        files={"file": ("poster.png", b"image", "image/png")},
+        data={"provider": "mock", "force_route": "ocr_first"}
+    )
+
+
+def test_stream_sends_fields_then_result(stream_client):
+    fields = {
+        "event_name": {"value": "Jazz Night", "confidence": 0.95, "source": "line 1"},
+        "date": {"value": "2026-03-15", "confidence": 0.9, "source": "line 2"},
+        "venue_name": {"value": "Blue Hall", "confidence": 0.8, "source": "line 3"}
+    }
+
+    response = post_stream(stream_client(StreamingAdapter(fields)))
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = parse_sse(response.text)
+    assert [event for event, _ in events] == ["field", "field", "field", "result"]
+    assert [data["name"] for _, data in events[:3]] == list(fields)
+    assert events[0][1]["value"] == fields["event_name"]
+    result = events[-1][1]
+    assert result["route"] == "ocr_first"
+    assert result["fields"]["event_name"]["value"] == "Jazz Night"
+
+
+def test_stream_repeats_fields_on_vision_fallback(stream_client):
+    adapter = StreamingAdapter({"event_name": {"value": "Jazz Night"}}, error=RuntimeError("bad response"))
+
+    events = parse_sse(post_stream(stream_client(adapter)).text)
+
+    assert [event for event, _ in events] == ["field", "field", "result"]
+    assert events[0] == events[1] == ("field", {"name": "event_name", "value": {"value": "Jazz Night"}})
+    assert events[-1][1]["route"] == "ocr_fallback_vision"
+
+
+class UnreadablePreprocessor:
+    async def process_async(self, image_bytes):
+        raise ValueError("Invalid image data")
+
+
+def test_stream_reports_failure_as_error_event(stream_client, monkeypatch):
+    client = stream_client(StreamingAdapter())
+    monkeypatch.setattr(extract, "preprocessor", UnreadablePreprocessor())
+
+    response = post_stream(client)
+
+    assert response.status_code == 200
+    assert parse_sse(response.text) == [
+        ("error", {"status_code": 400, "detail": "Image preprocessing failed: Invalid image data"})
+    ]
+
+
+def test_stream_rejects_invalid_request_before_streaming(stream_client):
+    response = stream_client(StreamingAdapter()).post(
+        "/api/v1/extract/stream",
+        files={"file": ("poster.txt", b"text", "text/plain")},
+        data={"provider": "mock"}
+    )
+
+    assert response.status_code == 400
+    assert not response.headers["content-type"].startswith("text/event-stream")